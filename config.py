@@ -16,4 +16,45 @@ class Config:
     BOT_TOKEN = os.getenv("BOT_TOKEN", default="")
     USER_ID = int(os.getenv("USER_ID", default=0))
     VERSION = os.getenv("VERSION", default="")
+    TICKER_CAPTURE_DIR = os.getenv("TICKER_CAPTURE_DIR", default="")
+    TICKER_CAPTURE_SEGMENT_MB = int(os.getenv("TICKER_CAPTURE_SEGMENT_MB", default=256))
+    TICKER_SHARDS = int(os.getenv("TICKER_SHARDS", default=1))
+    # 0 decodes frames on the event loop; "process" or "thread" pool otherwise
+    TICKER_DECODE_WORKERS = int(os.getenv("TICKER_DECODE_WORKERS", default=0))
+    TICKER_DECODE_MODE = os.getenv("TICKER_DECODE_MODE", default="process")
+    # seconds after a minute turns before every ticker closes it; < 0 disables
+    # the sweeper, minutes then close on the symbol's next tick or at closing end
+    TICKER_MINUTE_GRACE_S = float(os.getenv("TICKER_MINUTE_GRACE_S", default=2))
+    # "upstox", "off", or a directory of <symbol>.csv minute candles
+    TICKER_BACKFILL = os.getenv("TICKER_BACKFILL", default="upstox")
+    TICKER_BACKFILL_SETTLE_S = float(os.getenv("TICKER_BACKFILL_SETTLE_S", default=10))
+    # candle requests per second, kept well under Upstox's limits, which the
+    # token shares with the option-chain job; failed requests retry this often
+    TICKER_BACKFILL_RPS = float(os.getenv("TICKER_BACKFILL_RPS", default=2))
+    TICKER_BACKFILL_RETRIES = int(os.getenv("TICKER_BACKFILL_RETRIES", default=3))
+    # whole-shard frame stall that forces a reconnect, 0 disables the watchdog
+    TICKER_STALL_S = float(os.getenv("TICKER_STALL_S", default=30))
+    # a symbol without a tick for this long is reported as quiet
+    TICKER_QUIET_S = float(os.getenv("TICKER_QUIET_S", default=300))
+    # seconds between stocks-collection polls for added/removed instruments, 0 disables
+    TICKER_INSTRUMENT_SYNC_S = float(os.getenv("TICKER_INSTRUMENT_SYNC_S", default=60))
+    # 1 keeps a second, subscribed connection per shard to fail over to
+    TICKER_STANDBY = int(os.getenv("TICKER_STANDBY", default=0))
+    # frames the standby keeps for replay on promotion
+    TICKER_STANDBY_FRAMES = int(os.getenv("TICKER_STANDBY_FRAMES", default=256))
+    # VolumeTicker state for warm restarts, "" disables
+    TICKER_SNAPSHOT_PATH = os.getenv("TICKER_SNAPSHOT_PATH", default="snapshots/volume_ticker.bin")
+    TICKER_SNAPSHOT_S = float(os.getenv("TICKER_SNAPSHOT_S", default=5))
+    # CandleRollup bucket sizes in minutes, "" disables
+    TICKER_ROLLUP_MINUTES = [
+        int(m) for m in os.getenv("TICKER_ROLLUP_MINUTES", default="5,15,60").split(",") if m.strip()
+    ]
+    # VolumeTicker aggressor side: "tick" rule, or "quote" (top of book, then tick)
+    TICKER_TRADE_RULE = os.getenv("TICKER_TRADE_RULE", default="tick")
+    # 1 aggregates depth imbalance, spread and tbq/tsq per minute into book_history
+    TICKER_BOOK = int(os.getenv("TICKER_BOOK", default=0))
+    # price level of the minute VWAP / footprint rows, 0 disables
+    TICKER_FOOTPRINT_TICK = float(os.getenv("TICKER_FOOTPRINT_TICK", default=0))
+    INSERT_SPOOL_DIR = os.getenv("INSERT_SPOOL_DIR", default="spool")
+    INSERT_SPOOL_MAX_MB = int(os.getenv("INSERT_SPOOL_MAX_MB", default=512))
 
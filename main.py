@@ -5,6 +5,8 @@ from server.modules.telegram.commands import TGCommands
 from server.utils.logger import log
 from server.api import api_client
 from server.db import mongodb_client, clickhouse_client
+from server.db.spool import insert_spool
+from server.db.tables import Tables
 from asyncio import Task
 
 from server.modules.r_factor.r_factor_updater import RFactor
@@ -35,6 +37,9 @@ async def telegram_message_task_func(text: str):
     elif text.lower() == TGCommands.TICKER_STATUS.value:
         await Ticker.status()
 
+    elif text.lower() == TGCommands.SYNC_TICKER.value:
+        await Ticker.sync()
+
     elif text.lower() == TGCommands.START_UPDATE_R_FACTOR.value:
         if update_r_factor_task and not update_r_factor_task.done():
             await Telegram.send_message("update_r_factor_task is already running.")
@@ -105,6 +110,8 @@ async def main():
         await api_client.start()
         await mongodb_client.ensure_connection()
         await clickhouse_client.ensure_connection()
+        await Tables.ensure_schema()
+        insert_spool.start()
         # await mongodb_ticks_client.ensure_connection()
         await asyncio.Event().wait()
 
@@ -130,6 +137,7 @@ async def main():
                     pass
 
         await api_client.close()
+        await insert_spool.close()
         await mongodb_client.close()
         await clickhouse_client.close()
         # await mongodb_ticks_client.close()
@@ -0,0 +1,265 @@
+import asyncio
+import os
+import pickle
+import struct
+import zlib
+from typing import Dict, List, Tuple
+
+from config import Config
+from server.db import clickhouse_client
+from server.db.tables import _Tables
+from server.modules.telegram.telegram import Telegram
+from server.utils.logger import log
+
+
+# payload length, crc32 of payload
+RECORD_HEADER = struct.Struct("<II")
+
+SEGMENT_PREFIX = "spool-"
+SEGMENT_SUFFIX = ".bin"
+
+
+class InsertSpool:
+    """Write-ahead spool for ClickHouse batches whose insert failed.
+
+    Batches are stored column-oriented (zlib-compressed pickle) in
+    size-rotated segments and re-inserted oldest-first by a background task
+    once ClickHouse answers a ping again, with the batch's original
+    deduplication token so a partially replayed segment can be retried. When the spool is over
+    ``max_bytes`` the oldest segment is discarded.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        segment_size: int = 16 * 1024 * 1024,
+        retry_interval: float = 10.0,
+    ):
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_size = segment_size
+        self.RETRY_INTERVAL = retry_interval
+
+        self._lock = asyncio.Lock()
+        self._active: str | None = None
+        self._next_index = 1
+
+        self.replay_task: asyncio.Task | None = None
+
+        self.spooled_batches = 0
+        self.spooled_rows = 0
+        self.replayed_batches = 0
+        self.replayed_rows = 0
+        self.dropped_batches = 0
+        self.corrupt_records = 0
+
+    # ==========================================================
+    # SEGMENTS
+    # ==========================================================
+
+    def _segments(self) -> List[str]:
+
+        if not os.path.isdir(self.directory):
+            return []
+
+        names = sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def pending_bytes(self) -> int:
+        return sum(os.path.getsize(path) for path in self._segments())
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "pending_segments": len(self._segments()),
+            "pending_bytes": self.pending_bytes(),
+            "spooled_batches": self.spooled_batches,
+            "spooled_rows": self.spooled_rows,
+            "replayed_batches": self.replayed_batches,
+            "replayed_rows": self.replayed_rows,
+            "dropped_batches": self.dropped_batches,
+            "corrupt_records": self.corrupt_records,
+        }
+
+    # ==========================================================
+    # APPEND
+    # ==========================================================
+
+    def _append(self, record: bytes) -> int:
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        segments = self._segments()
+        if segments:
+            last = os.path.basename(segments[-1])
+            index = int(last[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+            self._next_index = max(self._next_index, index + 1)
+
+        if self._active is None or (
+            os.path.exists(self._active)
+            and os.path.getsize(self._active) + len(record) > self.segment_size
+        ):
+            self._active = os.path.join(
+                self.directory,
+                f"{SEGMENT_PREFIX}{self._next_index:08d}{SEGMENT_SUFFIX}",
+            )
+            self._next_index += 1
+
+        with open(self._active, "ab") as f:
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # bound disk usage by discarding the oldest closed segments
+        dropped = 0
+        total = self.pending_bytes()
+        for path in self._segments():
+            if total <= self.max_bytes or path == self._active:
+                break
+            total -= os.path.getsize(path)
+            dropped += sum(1 for _ in self._read_segment(path))
+            os.remove(path)
+
+        return dropped
+
+    async def append(
+        self, table: str, column_names: List[str], columns: List[list], token: str
+    ):
+
+        payload = zlib.compress(
+            pickle.dumps(
+                (table, column_names, columns, token),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        )
+        record = RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+        async with self._lock:
+            dropped = await asyncio.to_thread(self._append, record)
+
+        self.spooled_batches += 1
+        self.spooled_rows += len(columns[0]) if columns else 0
+
+        log.warning(
+            f"[InsertSpool.append] spooled {len(columns[0]) if columns else 0} rows for {table}"
+        )
+
+        if dropped:
+            self.dropped_batches += dropped
+            msg = f"[InsertSpool] spool over {self.max_bytes} bytes, dropped {dropped} oldest batches"
+            log.error(msg)
+            await Telegram.send_message(msg)
+
+    # ==========================================================
+    # REPLAY
+    # ==========================================================
+
+    def _read_segment(self, path: str) -> List[Tuple[str, List[str], List[list], str]]:
+
+        batches = []
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            length, crc = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            payload = data[offset : offset + length]
+            offset += length
+
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                # torn write from a crash mid-append
+                self.corrupt_records += 1
+                break
+
+            batches.append(pickle.loads(zlib.decompress(payload)))
+
+        return batches
+
+    async def replay(self) -> int:
+
+        replayed = 0
+
+        async with self._lock:
+            # stop appending to the segment we are about to drain
+            self._active = None
+            segments = self._segments()
+
+        for path in segments:
+
+            batches = await asyncio.to_thread(self._read_segment, path)
+
+            for table, column_names, columns, token in batches:
+                await _Tables(table).insert(
+                    rows=columns,
+                    column_names=column_names,
+                    column_oriented=True,
+                    dedup_token=token,
+                )
+                self.replayed_batches += 1
+                self.replayed_rows += len(columns[0]) if columns else 0
+                replayed += 1
+
+            if os.path.exists(path):
+                os.remove(path)
+
+        return replayed
+
+    async def _replay_loop(self):
+
+        while True:
+
+            await asyncio.sleep(self.RETRY_INTERVAL)
+
+            if not self._segments():
+                continue
+
+            try:
+                if not await clickhouse_client.client.ping():
+                    continue
+
+                replayed = await self.replay()
+
+                msg = f"[InsertSpool] replayed {replayed} spooled batches → {self.metrics()}"
+                log.info(msg)
+                await Telegram.send_message(msg)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning(f"[InsertSpool._replay_loop] ClickHouse still unavailable: {e}")
+
+    # ==========================================================
+    # START / CLOSE
+    # ==========================================================
+
+    def start(self):
+
+        if self.replay_task and not self.replay_task.done():
+            return
+
+        self.replay_task = asyncio.create_task(
+            self._replay_loop(), name="insert_spool_replay"
+        )
+
+    async def close(self):
+
+        if self.replay_task:
+            self.replay_task.cancel()
+            try:
+                await self.replay_task
+            except asyncio.CancelledError:
+                pass
+            self.replay_task = None
+
+
+insert_spool = InsertSpool(
+    directory=Config.INSERT_SPOOL_DIR,
+    max_bytes=Config.INSERT_SPOOL_MAX_MB * 1024 * 1024,
+)
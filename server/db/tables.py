@@ -2,12 +2,90 @@ from typing import Any, Sequence
 from server.api.exceptions import DatabaseException
 from server.utils.logger import log
 from server.db import clickhouse_client
+from server.modules.telegram.telegram import Telegram
 
 
 class _Tables:
 
-    def __init__(self, name: str) -> None:
+    # keep dedup hashes of the last N insert blocks on non-replicated tables,
+    # so a retried batch with the same insert_deduplication_token is a no-op
+    DEDUPLICATION_WINDOW = 10000
+
+    # ReplacingMergeTree version: epoch ns of the writer's first insert
+    # attempt, so a spool replay of an older batch never replaces newer rows
+    VERSION_COLUMN = "emitted_at"
+
+    def __init__(
+        self,
+        name: str,
+        columns: str | None = None,
+        order_by: str = "symbol, timestamp",
+        added_columns: Sequence[str] = (),
+    ) -> None:
         self.table_name = name
+        self.columns = columns
+        self.order_by = order_by
+        # columns added after the table first shipped: created with it, and
+        # ALTERed into tables that predate them
+        self.added_columns = tuple(added_columns)
+
+        # tables this module creates carry the version; ColumnarBatchWriter
+        # fills it for sinks that have one
+        self.version_column = self.VERSION_COLUMN if columns is not None else None
+        if self.version_column:
+            self.added_columns += (f"{self.version_column} UInt64 DEFAULT 0",)
+
+    # ---------------------------------------------------------
+    # SCHEMA
+    # ---------------------------------------------------------
+
+    async def ensure_table(self):
+
+        if self.columns is None:
+            return
+
+        # ReplacingMergeTree on the sorting key (symbol, timestamp) collapses
+        # any duplicate minute that still slips past block deduplication,
+        # keeping the most recently emitted row
+        engine = f"ReplacingMergeTree({self.version_column})"
+        await self.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table_name}
+            ({", ".join((self.columns, *self.added_columns))})
+            ENGINE = {engine}
+            PARTITION BY toDate(timestamp)
+            ORDER BY ({self.order_by})
+            SETTINGS non_replicated_deduplication_window = {self.DEDUPLICATION_WINDOW}
+            """
+        )
+
+        # tables created before the setting existed; ALTER only when needed
+        rows = await self.query(
+            "SELECT engine_full FROM system.tables "
+            "WHERE database = currentDatabase() AND name = {name:String}",
+            parameters={"name": self.table_name},
+        )
+        setting = f"non_replicated_deduplication_window = {self.DEDUPLICATION_WINDOW}"
+        if rows and setting not in rows[0][0]:
+            await self.execute(f"ALTER TABLE {self.table_name} MODIFY SETTING {setting}")
+
+        # the engine cannot be ALTERed: older tables keep the last inserted row
+        # until they are recreated
+        if rows and engine not in rows[0][0]:
+            msg = f"[Tables.ensure_table] {self.table_name} has no {self.version_column} version; recreate it so the newest row wins"
+            log.warning(msg)
+            await Telegram.send_message(msg)
+
+        if self.added_columns:
+            rows = await self.query(
+                "SELECT name FROM system.columns "
+                "WHERE database = currentDatabase() AND table = {name:String}",
+                parameters={"name": self.table_name},
+            )
+            existing = {row[0] for row in rows}
+            for column in self.added_columns:
+                if column.split()[0] not in existing:
+                    await self.execute(f"ALTER TABLE {self.table_name} ADD COLUMN {column}")
 
     # ---------------------------------------------------------
     # QUERY
@@ -36,7 +114,13 @@ class _Tables:
     # INSERT
     # ---------------------------------------------------------
 
-    async def insert(self, rows: list, column_names: list):
+    async def insert(
+        self,
+        rows: list,
+        column_names: list,
+        column_oriented: bool = False,
+        dedup_token: str | None = None,
+    ):
 
         try:
 
@@ -44,6 +128,12 @@ class _Tables:
                 self.table_name,
                 rows,
                 column_names=column_names,
+                column_oriented=column_oriented,
+                settings=(
+                    {"insert_deduplication_token": dedup_token}
+                    if dedup_token
+                    else None
+                ),
             )
 
         except Exception as e:
@@ -90,5 +180,100 @@ class _Tables:
 
 
 class Tables:
-    volume_history = _Tables("volume_history")
-    intraday_history = _Tables("intraday_history")
+    volume_history = _Tables(
+        "volume_history",
+        columns="""
+            symbol LowCardinality(String),
+            timestamp DateTime64(3, 'Asia/Kolkata'),
+            buy UInt32,
+            sell UInt32,
+            total UInt32,
+            delta Int32
+        """,
+        # 1 on rows GapBackfill derived from exchange candles (bar-level split)
+        added_columns=["backfilled UInt8 DEFAULT 0"],
+    )
+    intraday_history = _Tables(
+        "intraday_history",
+        columns="""
+            symbol LowCardinality(String),
+            timestamp DateTime64(3, 'Asia/Kolkata'),
+            open Float32,
+            high Float32,
+            low Float32,
+            close Float32,
+            volume UInt64
+        """,
+    )
+    # 5m / 15m / 60m bars, one row per (symbol, interval in minutes, bucket start)
+    volume_rollups = _Tables(
+        "volume_rollups",
+        columns="""
+            symbol LowCardinality(String),
+            interval UInt16,
+            timestamp DateTime64(3, 'Asia/Kolkata'),
+            open Float32,
+            high Float32,
+            low Float32,
+            close Float32,
+            volume UInt64,
+            buy UInt64,
+            sell UInt64,
+            delta Int64
+        """,
+        order_by="symbol, interval, timestamp",
+        # 1 when minutes lost to a feed gap are missing from the bucket
+        added_columns=["gap UInt8 DEFAULT 0"],
+    )
+    # per-minute order-book metrics, time-weighted average and close
+    book_history = _Tables(
+        "book_history",
+        columns="""
+            symbol LowCardinality(String),
+            timestamp DateTime64(3, 'Asia/Kolkata'),
+            imbalance_avg Float32,
+            imbalance_close Float32,
+            spread_avg Float32,
+            spread_close Float32,
+            tbq_tsq_avg Float32,
+            tbq_tsq_close Float32
+        """,
+    )
+    # minute VWAP from ltp x vtt increase, with the exchange's session VWAP (atp)
+    vwap_history = _Tables(
+        "vwap_history",
+        columns="""
+            symbol LowCardinality(String),
+            timestamp DateTime64(3, 'Asia/Kolkata'),
+            vwap Float32,
+            session_vwap Float32,
+            volume UInt64
+        """,
+    )
+    # minute volume-at-price, one row per traded price level
+    footprint_history = _Tables(
+        "footprint_history",
+        columns="""
+            symbol LowCardinality(String),
+            timestamp DateTime64(3, 'Asia/Kolkata'),
+            price Float32,
+            buy UInt32,
+            sell UInt32
+        """,
+        order_by="symbol, timestamp, price",
+    )
+
+    @classmethod
+    async def ensure_schema(cls):
+
+        for table in vars(cls).values():
+            if not isinstance(table, _Tables):
+                continue
+
+            # a schema problem must not keep the rest of the bot from starting
+            try:
+                await table.ensure_table()
+            except Exception as e:
+                msg = f"[Tables.ensure_schema] {table.table_name} failed: {e}"
+                log.error(msg)
+                await Telegram.send_message(msg)
@@ -10,6 +10,8 @@ class TGCommands(Enum):
     STOP_TICKER = "/stop_ticker"
     # Status of Websocket
     TICKER_STATUS = "/ticker_status"
+    # Subscribe/unsubscribe stocks added/removed since the ticker started
+    SYNC_TICKER = "/sync_ticker"
     # Start update_r_factor_loop
     START_UPDATE_R_FACTOR = "/start_update_r_factor"
     # Stop update_r_factor_loop
@@ -0,0 +1,326 @@
+import asyncio
+import csv
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Protocol, Tuple
+
+from server.db.spool import InsertSpool
+from server.db.tables import Tables
+from server.modules.telegram.telegram import Telegram
+from server.modules.ticker.batch_writer import ColumnarBatchWriter
+from server.modules.ticker.models import OhlcModel, RowSink
+from server.modules.ticker.ohlc_ticker import INTRADAY_COLUMNS
+from server.modules.token.enums import Developer
+from server.modules.upstox.services import UpstoxServices
+from server.utils.is_dt import ISDateTime
+from server.utils.logger import log
+
+
+# ==========================================================
+# SOURCES
+# ==========================================================
+
+
+class CandleSource(Protocol):
+
+    async def fetch(
+        self, instrument_key: str, symbol: str, from_ms: int, to_ms: int
+    ) -> List[OhlcModel]: ...
+
+
+class UpstoxCandleSource:
+    """1-minute candles from the Upstox intraday candle REST endpoint."""
+
+    def __init__(self, developer: Developer = Developer.ANKIT):
+        self.developer = developer
+
+    async def fetch(
+        self, instrument_key: str, symbol: str, from_ms: int, to_ms: int
+    ) -> List[OhlcModel]:
+
+        candles = await UpstoxServices.intraday_candles(instrument_key, self.developer)
+
+        result = []
+        for ts, open_, high, low, close, volume, *_ in candles:
+            timestamp = ISDateTime.fromisoformat(ts)
+            if from_ms <= int(timestamp.timestamp()) * 1000 <= to_ms:
+                result.append(
+                    OhlcModel(symbol, timestamp, open_, high, low, close, int(volume))
+                )
+
+        return result
+
+
+class FileCandleSource:
+    """Local stand-in: ``<directory>/<symbol>.csv`` rows of
+    ``timestamp_ms,open,high,low,close,volume``."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _read(self, symbol: str, from_ms: int, to_ms: int) -> List[OhlcModel]:
+
+        path = os.path.join(self.directory, f"{symbol}.csv")
+        if not os.path.exists(path):
+            return []
+
+        result = []
+        with open(path, newline="") as f:
+            for ts, open_, high, low, close, volume in csv.reader(f):
+                ts_ms = int(ts)
+                if from_ms <= ts_ms <= to_ms:
+                    result.append(
+                        OhlcModel(
+                            symbol,
+                            ISDateTime.from_timestamp(ts_ms),
+                            float(open_),
+                            float(high),
+                            float(low),
+                            float(close),
+                            int(volume),
+                        )
+                    )
+
+        return result
+
+    async def fetch(
+        self, instrument_key: str, symbol: str, from_ms: int, to_ms: int
+    ) -> List[OhlcModel]:
+        return await asyncio.to_thread(self._read, symbol, from_ms, to_ms)
+
+
+# ==========================================================
+# RATE LIMIT
+# ==========================================================
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart, across tasks;
+    ``rate`` <= 0 does not limit."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+                now = self._next
+            self._next = now + self.interval
+
+
+# ==========================================================
+# BACKFILL
+# ==========================================================
+
+
+@dataclass(slots=True)
+class Gap:
+    instrument_to_symbol: Dict[str, str]
+    # epoch ms of the last frame before the disconnect / first after reconnect
+    start_ms: int
+    end_ms: int
+
+
+class GapBackfill:
+    """Repairs volume_history and intraday_history minutes lost while a
+    feed shard was down.
+
+    A gap covers every minute from the one holding the last frame before
+    the disconnect to the one holding the reconnect; the edge minutes are
+    partial and the reconnect minute absorbs the whole vtt jump, so all of
+    them are rewritten, flagged ``backfilled``; VolumeTicker leaves them out
+    of the rollups. Candle requests are rate limited and retried. Repair
+    waits until the live rows of the reconnect minute have been written, so
+    the candle-derived rows are inserted after them and are the ones
+    ReplacingMergeTree keeps.
+    """
+
+    def __init__(
+        self,
+        source: CandleSource,
+        sink: RowSink = Tables.volume_history,
+        ohlc_sink: RowSink = Tables.intraday_history,
+        spool: InsertSpool | None = None,
+        settle: float = 10.0,
+        concurrency: int = 4,
+        rate: float = 2.0,
+        retries: int = 3,
+    ):
+
+        self.source = source
+        self.SETTLE = settle
+        self.RETRIES = retries
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limiter = RateLimiter(rate)
+
+        self.writer = ColumnarBatchWriter(
+            name="GapBackfill",
+            sink=sink,
+            column_names=[
+                "symbol",
+                "timestamp",
+                "buy",
+                "sell",
+                "total",
+                "delta",
+                "backfilled",
+            ],
+            spool=spool,
+        )
+        self.ohlc_writer = ColumnarBatchWriter(
+            name="GapBackfill.ohlc",
+            sink=ohlc_sink,
+            column_names=INTRADAY_COLUMNS,
+            spool=spool,
+        )
+
+        self._gaps: asyncio.Queue[Gap] = asyncio.Queue()
+        self.worker_task = asyncio.create_task(self._worker())
+
+        self.gaps_repaired = 0
+        self.rows_repaired = 0
+        self.fetch_failed = 0
+
+    # ==========================================================
+    # GAPS
+    # ==========================================================
+
+    def add_gap(self, instrument_to_symbol: Dict[str, str], start_ms: int, end_ms: int):
+        self._gaps.put_nowait(Gap(dict(instrument_to_symbol), start_ms, end_ms))
+
+    @staticmethod
+    def to_row(candle: OhlcModel) -> tuple:
+
+        # a candle has no aggressor split: bar-level tick rule, flat bars half/half
+        total = candle.volume
+        if candle.close > candle.open:
+            buy = total
+        elif candle.close < candle.open:
+            buy = 0
+        else:
+            buy = total // 2
+        sell = total - buy
+
+        return (candle.symbol, candle.timestamp, buy, sell, total, buy - sell, 1)
+
+    # ==========================================================
+    # REPAIR
+    # ==========================================================
+
+    async def _fetch(
+        self, instrument_key: str, symbol: str, from_ms: int, to_ms: int
+    ) -> List[OhlcModel] | None:
+
+        async with self._semaphore:
+            for attempt in range(self.RETRIES + 1):
+
+                await self._limiter.wait()
+
+                try:
+                    return await self.source.fetch(instrument_key, symbol, from_ms, to_ms)
+                except Exception as e:
+                    log.warning(f"[GapBackfill._fetch] {symbol} attempt {attempt + 1}: {e}")
+
+                if attempt < self.RETRIES:
+                    await asyncio.sleep(2**attempt)
+
+        # None: the symbol's gap minutes keep their live rows
+        self.fetch_failed += 1
+        return None
+
+    async def repair(self, gap: Gap) -> Tuple[int, List[str]]:
+
+        from_ms = gap.start_ms // 60000 * 60000
+        to_ms = gap.end_ms // 60000 * 60000
+
+        # live row of the reconnect minute is emitted after it closes
+        delay = (to_ms + 60000) / 1000 + self.SETTLE - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        results = await asyncio.gather(
+            *(
+                self._fetch(key, symbol, from_ms, to_ms)
+                for key, symbol in gap.instrument_to_symbol.items()
+            )
+        )
+
+        rows = 0
+        missing = []
+        for symbol, candles in zip(gap.instrument_to_symbol.values(), results):
+            if candles is None:
+                missing.append(symbol)
+                continue
+            for candle in candles:
+                self.writer.append(self.to_row(candle))
+                self.ohlc_writer.append(
+                    (
+                        candle.symbol,
+                        candle.timestamp,
+                        candle.open,
+                        candle.high,
+                        candle.low,
+                        candle.close,
+                        candle.volume,
+                    )
+                )
+                rows += 1
+
+        self.writer.request_flush()
+        self.ohlc_writer.request_flush()
+
+        self.gaps_repaired += 1
+        self.rows_repaired += rows
+
+        return rows, missing
+
+    async def _worker(self):
+
+        while True:
+
+            gap = await self._gaps.get()
+
+            try:
+                rows, missing = await self.repair(gap)
+
+                msg = (
+                    f"[GapBackfill] repaired {rows} minutes for {len(gap.instrument_to_symbol) - len(missing)} symbols "
+                    f"{ISDateTime.from_timestamp(gap.start_ms).time()} → {ISDateTime.from_timestamp(gap.end_ms).time()}"
+                )
+                if missing:
+                    msg += f"; {len(missing)} symbols not repaired: {', '.join(missing[:20])}"
+                    log.warning(msg)
+                else:
+                    log.info(msg)
+                await Telegram.send_message(msg)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"[GapBackfill._worker] repair failed: {e}")
+                await Telegram.send_message(f"[GapBackfill] repair failed: {e}")
+            finally:
+                self._gaps.task_done()
+
+    # ==========================================================
+    # CLOSE
+    # ==========================================================
+
+    async def close(self):
+
+        # pending gaps wait for their minute to settle; they are not worth
+        # holding shutdown for
+        self.worker_task.cancel()
+        try:
+            await self.worker_task
+        except asyncio.CancelledError:
+            pass
+
+        await self.writer.close()
+        await self.ohlc_writer.close()
@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import time
+from typing import List, Sequence
+
+from server.db.spool import InsertSpool
+from server.modules.ticker.models import RowSink
+from server.utils.logger import log
+
+
+class ColumnarBatchWriter:
+    """Column buffers appended in place and swapped out whole at flush.
+
+    Two sets of column lists alternate: producers append to the active set
+    while the writer task inserts the other one column-oriented, then clears
+    it for reuse.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sink: RowSink,
+        column_names: Sequence[str],
+        spool: InsertSpool | None = None,
+        flush_interval: float = 1.0,
+        max_rows: int = 50000,
+    ):
+
+        self.name = name
+        self.sink = sink
+        self.spool = spool
+        self.column_names = list(column_names)
+
+        # ReplacingMergeTree version of ClickHouse tables, stamped per batch
+        self.version_column = getattr(sink, "version_column", None)
+
+        self.FLUSH_INTERVAL = flush_interval
+        self.MAX_ROWS = max_rows
+
+        self.columns: List[list] = [[] for _ in self.column_names]
+        self._spare: List[list] = [[] for _ in self.column_names]
+
+        self.rows_written = 0
+        self.rows_spooled = 0
+        self.rows_failed = 0
+
+        self._wakeup = asyncio.Event()
+        self._closing = False
+
+        self.writer_task = asyncio.create_task(self.db_writer())
+
+    # ==========================================================
+    # APPEND
+    # ==========================================================
+
+    def append(self, row: Sequence) -> None:
+
+        columns = self.columns
+
+        for column, value in zip(columns, row):
+            column.append(value)
+
+        if len(columns[0]) >= self.MAX_ROWS:
+            self._wakeup.set()
+
+    def request_flush(self) -> None:
+        self._wakeup.set()
+
+    # ==========================================================
+    # FLUSH
+    # ==========================================================
+
+    def swap(self) -> List[list]:
+
+        columns = self.columns
+        self.columns = self._spare
+        self._spare = columns
+        return columns
+
+    def dedup_token(self, columns: List[list]) -> str:
+
+        # content hash: a retry or spool replay of the same rows gets the same
+        # token, so ClickHouse drops it as an already inserted block
+        digest = hashlib.blake2b(repr(columns).encode(), digest_size=16)
+        return f"{self.sink.table_name}-{digest.hexdigest()}"
+
+    async def flush_batch(self):
+
+        if not self.columns[0]:
+            return
+
+        columns = self.swap()
+        count = len(columns[0])
+        token = self.dedup_token(columns)
+
+        column_names = self.column_names
+        if self.version_column:
+            # stamped before the first attempt and spooled with the rows
+            columns = [*columns, [time.time_ns()] * count]
+            column_names = [*column_names, self.version_column]
+
+        try:
+
+            await self.sink.insert(
+                rows=columns,
+                column_names=column_names,
+                column_oriented=True,
+                dedup_token=token,
+            )
+            self.rows_written += count
+
+        except Exception as e:
+            log.error(f"[{self.name}.flush_batch] Batch insert failed: {e}")
+
+            if self.spool:
+                try:
+                    # the spool keeps its own copy, the buffers are reused below
+                    await self.spool.append(
+                        self.sink.table_name,
+                        column_names,
+                        [list(column) for column in columns],
+                        token,
+                    )
+                    self.rows_spooled += count
+                except Exception as e:
+                    self.rows_failed += count
+                    log.error(f"[{self.name}.flush_batch] spool append failed: {e}")
+            else:
+                self.rows_failed += count
+
+        for column in columns:
+            column.clear()
+
+    # ==========================================================
+    # DB WRITER
+    # ==========================================================
+
+    async def db_writer(self):
+        # logged only: Ticker sends one summary for all of its writers
+        log.info(f"[{self.name}.db_writer] started")
+
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+            await self.flush_batch()
+
+        # rows appended while the last insert was in flight
+        await self.flush_batch()
+
+        log.info(
+            f"[{self.name}.db_writer] stopped and flushed all rows: "
+            f"written={self.rows_written} spooled={self.rows_spooled} failed={self.rows_failed}"
+        )
+
+    # ==========================================================
+    # CLOSE
+    # ==========================================================
+
+    def summary(self) -> str:
+        summary = f"{self.name} {self.rows_written}"
+        if self.rows_spooled or self.rows_failed:
+            summary += f" (spooled {self.rows_spooled}, failed {self.rows_failed})"
+        return summary
+
+    async def close(self):
+
+        # let an in-flight insert finish instead of cancelling it mid-batch
+        self._closing = True
+        self._wakeup.set()
+        await self.writer_task
@@ -0,0 +1,245 @@
+from array import array
+from typing import List, Sequence
+
+from server.db.spool import InsertSpool
+from server.db.tables import Tables
+from server.modules.ticker.batch_writer import ColumnarBatchWriter
+from server.modules.ticker.minute_ticker import MinuteTicker
+from server.modules.ticker.models import RowSink
+from server.utils.is_dt import ISDateTime
+from server.utils.logger import log
+
+
+BOOK_COLUMNS = [
+    "symbol",
+    "timestamp",
+    "imbalance_avg",
+    "imbalance_close",
+    "spread_avg",
+    "spread_close",
+    "tbq_tsq_avg",
+    "tbq_tsq_close",
+]
+
+
+class BookTicker(MinuteTicker):
+    """Per-minute order-book metrics: depth imbalance, top-of-book spread
+    and the tbq/tsq ratio, each as a time-weighted average and a close.
+
+    A value holds from the frame that reported it (``currentTs``) until the
+    symbol's next update, so a minute opens with the value carried over
+    from the previous one. Symbol ids are VolumeTicker's; ``symbols`` is
+    its list, shared.
+    """
+
+    # MarketFullFeed fields read from each tick
+    FEED_FIELDS = frozenset({"ltpc", "marketLevel", "tbq", "tsq"})
+
+    def __init__(
+        self,
+        symbols: List[str],
+        sink: RowSink = Tables.book_history,
+        spool: InsertSpool | None = None,
+    ):
+
+        self.symbols = symbols
+        self.size = 0
+
+        # per-symbol state, indexed by symbol id; updated_ms == 0 means no
+        # book seen yet
+        self.minute = array("q")
+        self.updated_ms = array("q")
+        # 1 while the symbol's minute holds updates not yet emitted
+        self.open = array("b")
+        self.imbalance = array("d")
+        self.spread = array("d")
+        self.tbq_tsq = array("d")
+        # value x ms held, and ms covered, within the open minute
+        self.imbalance_sum = array("d")
+        self.spread_sum = array("d")
+        self.tbq_tsq_sum = array("d")
+        self.weight_ms = array("q")
+
+        self.writer = ColumnarBatchWriter(
+            name="BookTicker",
+            sink=sink,
+            column_names=BOOK_COLUMNS,
+            spool=spool,
+        )
+
+        # minutes are closed by Ticker's sweeper, with the other tickers'
+        self.closed_minute = 0
+
+        log.info("[BookTicker] initialized")
+
+    # ==========================================================
+    # SYMBOLS
+    # ==========================================================
+
+    def grow(self):
+
+        new = len(self.symbols) - self.size
+        if new <= 0:
+            return
+
+        zeros_d = array("d", bytes(8 * new))
+        zeros_q = array("q", bytes(8 * new))
+
+        self.minute.extend(zeros_q)
+        self.updated_ms.extend(zeros_q)
+        self.open.extend(array("b", bytes(new)))
+        self.imbalance.extend(zeros_d)
+        self.spread.extend(zeros_d)
+        self.tbq_tsq.extend(zeros_d)
+        self.imbalance_sum.extend(zeros_d)
+        self.spread_sum.extend(zeros_d)
+        self.tbq_tsq_sum.extend(zeros_d)
+        self.weight_ms.extend(zeros_q)
+
+        self.size = len(self.symbols)
+
+    # ==========================================================
+    # EMIT
+    # ==========================================================
+
+    def emit_minute(self, sid: int):
+
+        # the last value holds to the end of the minute
+        held = (self.minute[sid] + 1) * 60000 - self.updated_ms[sid]
+        weight = self.weight_ms[sid] + held
+
+        imbalance = self.imbalance[sid]
+        spread = self.spread[sid]
+        tbq_tsq = self.tbq_tsq[sid]
+
+        self.writer.append(
+            (
+                self.symbols[sid],
+                ISDateTime.from_timestamp(self.minute[sid] * 60000),
+                (self.imbalance_sum[sid] + imbalance * held) / weight,
+                imbalance,
+                (self.spread_sum[sid] + spread * held) / weight,
+                spread,
+                (self.tbq_tsq_sum[sid] + tbq_tsq * held) / weight,
+                tbq_tsq,
+            )
+        )
+
+    # ==========================================================
+    # PROCESS TICKS
+    # ==========================================================
+
+    def process_ticks(
+        self,
+        sids: Sequence[int],
+        ts_ms: int,
+        bids: Sequence[float],
+        asks: Sequence[float],
+        bid_qtys: Sequence[int],
+        ask_qtys: Sequence[int],
+        tbqs: Sequence[float],
+        tsqs: Sequence[float],
+    ) -> int:
+
+        if len(self.symbols) > self.size:
+            self.grow()
+
+        state_minute = self.minute
+        state_updated = self.updated_ms
+        state_open = self.open
+        state_imbalance = self.imbalance
+        state_spread = self.spread
+        state_tbq_tsq = self.tbq_tsq
+        imbalance_sum = self.imbalance_sum
+        spread_sum = self.spread_sum
+        tbq_tsq_sum = self.tbq_tsq_sum
+        weight_ms = self.weight_ms
+
+        # one frame, one timestamp; late frames fold into the open minute
+        minute = ts_ms // 60000
+        if minute <= self.closed_minute:
+            minute = self.closed_minute + 1
+            ts_ms = minute * 60000
+
+        emitted = 0
+
+        for sid, bid, ask, bid_qty, ask_qty, tbq, tsq in zip(
+            sids, bids, asks, bid_qtys, ask_qtys, tbqs, tsqs
+        ):
+
+            # no depth on this tick
+            if not bid or not ask:
+                continue
+
+            # repeated or older frame (e.g. replayed from a standby buffer)
+            updated = state_updated[sid]
+            if ts_ms <= updated:
+                continue
+
+            depth_qty = bid_qty + ask_qty
+            imbalance = (bid_qty - ask_qty) / depth_qty if depth_qty else 0.0
+            spread = ask - bid
+            tbq_tsq = tbq / tsq if tsq else 0.0
+
+            if updated == 0:
+                # first book for the symbol: the minute starts here
+                imbalance_sum[sid] = spread_sum[sid] = tbq_tsq_sum[sid] = 0.0
+                weight_ms[sid] = 0
+                state_minute[sid] = minute
+                state_open[sid] = 1
+
+            elif minute != state_minute[sid] or not state_open[sid]:
+
+                if state_open[sid]:
+                    self.emit_minute(sid)
+                    emitted += 1
+
+                # previous value carried from the minute's start
+                held = ts_ms - minute * 60000
+                imbalance_sum[sid] = state_imbalance[sid] * held
+                spread_sum[sid] = state_spread[sid] * held
+                tbq_tsq_sum[sid] = state_tbq_tsq[sid] * held
+                weight_ms[sid] = held
+                state_minute[sid] = minute
+                state_open[sid] = 1
+
+            else:
+                held = ts_ms - updated
+                imbalance_sum[sid] += state_imbalance[sid] * held
+                spread_sum[sid] += state_spread[sid] * held
+                tbq_tsq_sum[sid] += state_tbq_tsq[sid] * held
+                weight_ms[sid] += held
+
+            state_updated[sid] = ts_ms
+            state_imbalance[sid] = imbalance
+            state_spread[sid] = spread
+            state_tbq_tsq[sid] = tbq_tsq
+
+        return emitted
+
+    # ==========================================================
+    # MINUTE SWEEP
+    # ==========================================================
+
+    def close_minutes(self, before_minute: int) -> int:
+
+        emitted = self.close_open_minutes(self.size, before_minute)
+
+        if emitted:
+            self.writer.request_flush()
+
+        return emitted
+
+    # ==========================================================
+    # DISPOSE
+    # ==========================================================
+
+    async def dispose(self):
+
+        log.info("[BookTicker.dispose] started")
+
+        self.close_minutes(2**62)
+
+        await self.writer.close()
+
+        log.info("[BookTicker.dispose] stopped")
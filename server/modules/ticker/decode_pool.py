@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from server.modules.ticker.feed_processor import DecodedFrame, FeedProcessor, decode_frame
+from server.utils.logger import log
+
+
+class DecodePool:
+    """Moves ParseFromString and field extraction off the event loop.
+
+    The receive loop submits raw frames; decoded tick columns are applied to
+    the FeedProcessor by a single task in the order the frames arrived.
+    ``max_pending`` bounds frames in flight, so a slow pool pushes back on
+    ``ws.recv()`` instead of growing memory.
+    """
+
+    def __init__(
+        self,
+        processor: FeedProcessor,
+        workers: int,
+        mode: str = "process",
+        max_pending: int = 1024,
+    ):
+
+        self.processor = processor
+        self.mode = mode
+
+        self.executor: Executor
+        if mode == "process":
+            # spawn: the parent has live threads (journal writer, executor)
+            self.executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            self.executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="feed-decode"
+            )
+
+        self._pending: asyncio.Queue[asyncio.Future[DecodedFrame | None]] = (
+            asyncio.Queue(maxsize=max_pending)
+        )
+
+        self.frames_failed = 0
+
+        self.apply_task = asyncio.create_task(self._apply_loop())
+
+        log.info(f"[DecodePool] {workers} {mode} workers")
+
+    # ==========================================================
+    # SUBMIT (receive path)
+    # ==========================================================
+
+    async def submit(self, message: bytes):
+
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            decode_frame,
+            message,
+            self.processor.session_start_ms,
+            self.processor.session_end_ms,
+            self.processor.lite,
+            self.processor.depth,
+            self.processor.book,
+            self.processor.atp,
+        )
+        await self._pending.put(future)
+
+    # ==========================================================
+    # APPLY
+    # ==========================================================
+
+    async def _apply_loop(self):
+
+        processor = self.processor
+
+        while True:
+
+            future = await self._pending.get()
+
+            try:
+                decoded = await future
+
+                if decoded is not None:
+                    processor.apply(decoded)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.frames_failed += 1
+                log.error(f"[DecodePool._apply_loop] decode failed: {e}")
+            finally:
+                self._pending.task_done()
+
+    # ==========================================================
+    # CLOSE
+    # ==========================================================
+
+    async def close(self):
+
+        # apply everything already received before the tickers flush
+        await self._pending.join()
+
+        self.apply_task.cancel()
+        try:
+            await self.apply_task
+        except asyncio.CancelledError:
+            pass
+
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+        log.info("[DecodePool.close] stopped")
@@ -0,0 +1,399 @@
+import threading
+from dataclasses import dataclass, field
+from datetime import date, time
+from typing import Dict, List, Tuple
+
+import server.modules.ticker.marketfeed_lite_pb2 as pb_lite
+import server.modules.ticker.marketfeed_pb2 as pb
+from server.modules.ticker.book_ticker import BookTicker
+from server.modules.ticker.index_ticker import IndexTicker
+from server.modules.ticker.volume_ticker_clickhouse import VolumeTicker
+from server.utils.is_dt import ISDateTime
+from server.utils.logger import log
+from server.utils.market_state import NSE_EQ, TRADING, MarketState, MarketStatus
+
+
+@dataclass(slots=True)
+class DecodedFrame:
+    instrument_keys: List[str] = field(default_factory=list)
+    ltps: List[float] = field(default_factory=list)
+    ltts: List[int] = field(default_factory=list)
+    vtts: List[int] = field(default_factory=list)
+    # top-of-book price per tick, 0.0 without depth; decoded with depth only
+    bids: List[float] | None = None
+    asks: List[float] | None = None
+    # depth quantity summed over the levels, and tbq/tsq; decoded with book only
+    bid_qtys: List[int] | None = None
+    ask_qtys: List[int] | None = None
+    tbqs: List[float] | None = None
+    tsqs: List[float] | None = None
+    # exchange session VWAP; decoded with atp only
+    atps: List[float] | None = None
+    # (instrument_key, ltp, ltt) of indexFF feeds, created on the first one
+    index_ticks: List[Tuple[str, float, int]] | None = None
+    # set on market_info frames only
+    market_status: Dict[str, int] | None = None
+    # server time of the frame
+    current_ts: int = 0
+
+
+# MarketFullFeed fields kept by marketfeed_lite.proto; greeks and OHLC
+# candles are skipped as unknown fields instead of being materialised, and
+# depth unless a consumer reads it (DepthFeedResponse)
+LITE_FIELDS = frozenset({"ltpc", "marketLevel", "atp", "vtt", "oi", "iv", "tbq", "tsq"})
+
+
+def use_lite(fields) -> bool:
+    return set(fields) <= LITE_FIELDS
+
+
+def is_index_key(instrument_key: str) -> bool:
+    # NSE_INDEX|Nifty 50, BSE_INDEX|SENSEX
+    return "_INDEX|" in instrument_key
+
+
+_local = threading.local()
+
+
+def decode_frame(
+    message: bytes | memoryview,
+    session_start_ms: int,
+    session_end_ms: int,
+    lite: bool = False,
+    depth: bool = False,
+    book: bool = False,
+    atp: bool = False,
+) -> DecodedFrame | None:
+
+    # module level and self-contained so it can run in a thread or process pool
+    if lite and depth:
+        obj = getattr(_local, "lite_depth", None)
+        if obj is None:
+            obj = _local.lite_depth = pb_lite.DepthFeedResponse()
+    elif lite:
+        obj = getattr(_local, "lite", None)
+        if obj is None:
+            obj = _local.lite = pb_lite.FeedResponse()
+    else:
+        obj = getattr(_local, "obj", None)
+        if obj is None:
+            obj = _local.obj = pb.FeedResponse()
+
+    obj.Clear()
+
+    try:
+        obj.ParseFromString(message)
+    except Exception:
+        log.warning("obj.ParseFromString failed")
+        return None
+
+    if obj.type == pb.Type.market_info:
+        return DecodedFrame(
+            market_status=dict(obj.marketInfo.segmentStatus),
+            current_ts=obj.currentTs,
+        )
+
+    if obj.type != pb.Type.initial_feed and obj.type != pb.Type.live_feed:
+        return None
+
+    if session_end_ms < session_start_ms:
+        # segment not trading, only market_info frames matter
+        return None
+
+    decoded = DecodedFrame(current_ts=obj.currentTs)
+    instrument_keys = decoded.instrument_keys
+    ltps = decoded.ltps
+    ltts = decoded.ltts
+    vtts = decoded.vtts
+    if depth:
+        bids = decoded.bids = []
+        asks = decoded.asks = []
+    if book:
+        bid_qtys = decoded.bid_qtys = []
+        ask_qtys = decoded.ask_qtys = []
+        tbqs = decoded.tbqs = []
+        tsqs = decoded.tsqs = []
+    if atp:
+        atps = decoded.atps = []
+
+    for instrument_key, feed in obj.feeds.items():
+
+        if feed.WhichOneof("FeedUnion") != "fullFeed":
+            continue
+
+        full_feed = feed.fullFeed
+
+        feed_type = full_feed.WhichOneof("FullFeedUnion")
+
+        if feed_type == "marketFF":
+            marketFF = full_feed.marketFF
+            ltpc = marketFF.ltpc
+            ltt = ltpc.ltt
+
+            if not session_start_ms <= ltt <= session_end_ms:
+                continue
+
+            # oi = int(marketFF.oi)
+
+            instrument_keys.append(instrument_key)
+            ltps.append(ltpc.ltp)
+            ltts.append(ltt)
+            vtts.append(marketFF.vtt)
+            if atp:
+                atps.append(marketFF.atp)  # type: ignore
+
+            if depth:
+                quotes = marketFF.marketLevel.bidAskQuote
+                if quotes:
+                    top = quotes[0]
+                    bids.append(top.bidP)  # type: ignore
+                    asks.append(top.askP)  # type: ignore
+                else:
+                    bids.append(0.0)  # type: ignore
+                    asks.append(0.0)  # type: ignore
+
+                if book:
+                    bid_qty = ask_qty = 0
+                    for quote in quotes:
+                        bid_qty += quote.bidQ
+                        ask_qty += quote.askQ
+                    bid_qtys.append(bid_qty)  # type: ignore
+                    ask_qtys.append(ask_qty)  # type: ignore
+                    tbqs.append(marketFF.tbq)  # type: ignore
+                    tsqs.append(marketFF.tsq)  # type: ignore
+
+        elif feed_type == "indexFF":
+            ltpc = full_feed.indexFF.ltpc
+            ltt = ltpc.ltt
+
+            if not session_start_ms <= ltt <= session_end_ms:
+                continue
+
+            if decoded.index_ticks is None:
+                decoded.index_ticks = []
+            decoded.index_ticks.append((instrument_key, ltpc.ltp, ltt))
+
+    return decoded
+
+
+class FeedProcessor:
+
+    # https://www.nseindia.com/static/market-data/market-timings
+    # Block Deal session 1 Open 	        08:45 hrs -- Start
+    # Trade Modification cut-off time * 	16:15 hrs -- End
+    MARKET_START = time(9, 15)
+    MARKET_END = time(16, 00)
+
+    SEGMENT = NSE_EQ
+    SESSION_OPEN_END = 2**63 - 1
+
+    def __init__(
+        self,
+        volume_ticker: VolumeTicker,
+        instrument_to_symbol: Dict[str, str],
+        today: date,
+        index_ticker: IndexTicker | None = None,
+        book_ticker: BookTicker | None = None,
+    ):
+
+        self.volume_ticker = volume_ticker
+        self.index_ticker = index_ticker
+        self.book_ticker = book_ticker
+        self.instrument_to_symbol: Dict[str, str] = {}
+
+        # decode only what the consumers read
+        self.feed_fields = frozenset(volume_ticker.FEED_FIELDS)
+        if index_ticker:
+            self.feed_fields |= index_ticker.FEED_FIELDS
+        if book_ticker:
+            self.feed_fields |= book_ticker.FEED_FIELDS
+        self.lite = use_lite(self.feed_fields)
+        self.depth = "marketLevel" in self.feed_fields
+        self.book = book_ticker is not None
+        self.atp = "atp" in self.feed_fields
+
+        # intern instrument keys to dense ticker symbol ids up front
+        self.instrument_to_id: Dict[str, int] = {}
+        self.index_to_id: Dict[str, int] = {}
+        self.add_instruments(instrument_to_symbol)
+
+        self.today = today
+
+        # session window as epoch-ms, so the per-tick filter is two int compares;
+        # the clock window holds until the feed reports the segment status
+        self.session_start_ms = ISDateTime.to_timestamp(today, self.MARKET_START)
+        self.session_end_ms = ISDateTime.to_timestamp(today, self.MARKET_END)
+
+        # status reported earlier today, e.g. before a ticker restart
+        status = MarketState.get(self.SEGMENT)
+        changed_at = MarketState.changed_at.get(self.SEGMENT, 0)
+        if status is not None and changed_at >= ISDateTime.to_timestamp(today, time(0, 0)):
+            self.on_status(None, status, 0)
+
+    # ==========================================================
+    # MARKET STATUS
+    # ==========================================================
+
+    def on_status(
+        self, old: MarketStatus | None, new: MarketStatus, ts_ms: int
+    ):
+
+        if new in TRADING:
+            if old in (MarketStatus.PRE_OPEN_START, MarketStatus.PRE_OPEN_END):
+                # watched the open: nothing before it belongs to this session
+                self.session_start_ms = ts_ms // 60000 * 60000
+            elif old is None or old not in TRADING:
+                # joined mid-session: only drop ticks left over from previous days
+                self.session_start_ms = ISDateTime.to_timestamp(self.today, time(0, 0))
+            self.session_end_ms = self.SESSION_OPEN_END
+
+        else:
+            # pre-open or closed: frames are dropped before the feed loop
+            self.session_start_ms = 0
+            self.session_end_ms = -1
+
+            if new == MarketStatus.CLOSING_END and ts_ms:
+                closed = self.close_minutes(ts_ms // 60000 + 1)
+                log.info(f"[FeedProcessor.on_status] closing end, flushed {closed} minute rows")
+
+    # ==========================================================
+    # MINUTE CLOSE
+    # ==========================================================
+
+    def close_minutes(self, before_minute: int) -> int:
+
+        # one boundary for every ticker, so their rows cover the same minutes
+        closed = self.volume_ticker.close_minutes(before_minute)
+        if self.index_ticker:
+            closed += self.index_ticker.close_minutes(before_minute)
+        if self.book_ticker:
+            closed += self.book_ticker.close_minutes(before_minute)
+
+        return closed
+
+    def on_market_info(self, decoded: DecodedFrame):
+
+        for segment, old, new in MarketState.update(
+            decoded.market_status, decoded.current_ts  # type: ignore
+        ):
+            if segment == self.SEGMENT:
+                self.on_status(old, new, decoded.current_ts)
+
+    # ==========================================================
+    # INSTRUMENTS
+    # ==========================================================
+
+    def add_instruments(self, instrument_to_symbol: Dict[str, str]):
+
+        # a symbol seen before (e.g. unsubscribed earlier, or a new instrument
+        # key for the same stock) gets its old id back, with its state
+        keys = [key for key in instrument_to_symbol if not is_index_key(key)]
+        ids = self.volume_ticker.register(instrument_to_symbol[key] for key in keys)
+        self.instrument_to_id.update(zip(keys, ids))
+
+        if self.index_ticker:
+            keys = [key for key in instrument_to_symbol if is_index_key(key)]
+            ids = self.index_ticker.register(instrument_to_symbol[key] for key in keys)
+            self.index_to_id.update(zip(keys, ids))
+
+        self.instrument_to_symbol.update(instrument_to_symbol)
+
+    def remove_instruments(self, instrument_keys: List[str]):
+
+        # ticker state stays; the open minute is emitted as usual
+        for key in instrument_keys:
+            self.instrument_to_id.pop(key, None)
+            self.index_to_id.pop(key, None)
+            self.instrument_to_symbol.pop(key, None)
+
+    # ==========================================================
+    # PROCESS FRAME
+    # ==========================================================
+
+    def process_frame(self, message: bytes | memoryview) -> int:
+
+        decoded = decode_frame(
+            message,
+            self.session_start_ms,
+            self.session_end_ms,
+            self.lite,
+            self.depth,
+            self.book,
+            self.atp,
+        )
+
+        if decoded is None:
+            return 0
+
+        return self.apply(decoded)
+
+    def apply(self, decoded: DecodedFrame) -> int:
+
+        if decoded.market_status is not None:
+            self.on_market_info(decoded)
+            return 0
+
+        if decoded.index_ticks and self.index_ticker:
+            self.apply_index(decoded.index_ticks)
+
+        if not decoded.instrument_keys:
+            return 0
+
+        sids = list(map(self.instrument_to_id.get, decoded.instrument_keys))
+        ltps = decoded.ltps
+        ltts = decoded.ltts
+        vtts = decoded.vtts
+        bids = decoded.bids
+        asks = decoded.asks
+        book = (decoded.bid_qtys, decoded.ask_qtys, decoded.tbqs, decoded.tsqs)
+        atps = decoded.atps
+
+        if None in sids:
+            # instruments we did not subscribe to (or no longer track)
+            keep = [i for i, sid in enumerate(sids) if sid is not None]
+            sids = [sids[i] for i in keep]
+            ltps = [ltps[i] for i in keep]
+            ltts = [ltts[i] for i in keep]
+            vtts = [vtts[i] for i in keep]
+            if bids is not None and asks is not None:
+                bids = [bids[i] for i in keep]
+                asks = [asks[i] for i in keep]
+            if book[0] is not None:
+                book = tuple([column[i] for i in keep] for column in book)  # type: ignore
+            if atps is not None:
+                atps = [atps[i] for i in keep]
+
+        if not sids:
+            return 0
+
+        # volume ticker
+        self.volume_ticker.process_ticks(sids, ltps, ltts, vtts, bids, asks)  # type: ignore
+
+        footprint = self.volume_ticker.footprint
+        if footprint and atps is not None:
+            footprint.update_session(sids, atps)  # type: ignore
+
+        # order book, keyed by the same symbol ids
+        if self.book_ticker and book[0] is not None:
+            self.book_ticker.process_ticks(
+                sids, decoded.current_ts, bids, asks, *book  # type: ignore
+            )
+
+        return len(sids)
+
+    def apply_index(self, index_ticks: List[Tuple[str, float, int]]):
+
+        index_to_id = self.index_to_id
+        sids = []
+        ltps = []
+        ltts = []
+
+        for key, ltp, ltt in index_ticks:
+            sid = index_to_id.get(key)
+            if sid is not None:
+                sids.append(sid)
+                ltps.append(ltp)
+                ltts.append(ltt)
+
+        if sids:
+            self.index_ticker.process_ticks(sids, ltps, ltts)  # type: ignore
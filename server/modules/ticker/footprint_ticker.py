@@ -0,0 +1,244 @@
+from array import array
+from typing import List, Sequence
+
+from server.db.spool import InsertSpool
+from server.db.tables import Tables
+from server.modules.ticker.batch_writer import ColumnarBatchWriter
+from server.modules.ticker.models import Direction, RowSink
+from server.utils.is_dt import ISDateTime
+
+
+VWAP_COLUMNS = ["symbol", "timestamp", "vwap", "session_vwap", "volume"]
+FOOTPRINT_COLUMNS = ["symbol", "timestamp", "price", "buy", "sell"]
+
+
+class FootprintTicker:
+    """Per-minute VWAP and volume-at-price footprint, driven by VolumeTicker.
+
+    Each classified vtt increase is binned at its ltp, rounded to ``tick``.
+    Every symbol's bins are a pair of array columns over a window of price
+    levels starting at ``base``. The window grows only when one minute's
+    range outgrows it, and it re-centres when a minute opens outside it.
+    Minutes close with VolumeTicker's, so nothing here keeps its own clock.
+    """
+
+    # bins allocated for a symbol's first minute, and headroom on growth
+    INITIAL_BINS = 32
+    GROW_MARGIN = 16
+
+    def __init__(
+        self,
+        tick: float = 0.05,
+        vwap_sink: RowSink = Tables.vwap_history,
+        footprint_sink: RowSink = Tables.footprint_history,
+        spool: InsertSpool | None = None,
+    ):
+
+        self.TICK = tick
+        self.size = 0
+
+        # per-symbol columns, indexed by VolumeTicker's symbol id
+        self.base = array("q")
+        # touched price levels of the open minute; empty while hi < lo
+        self.lo = array("q")
+        self.hi = array("q")
+        self.bin_buy: List[array] = []
+        self.bin_sell: List[array] = []
+        self.minute_notional = array("d")
+        self.minute_volume = array("q")
+        # exchange session VWAP, the latest atp
+        self.atp = array("d")
+
+        self.vwap_writer = ColumnarBatchWriter(
+            name="FootprintTicker.vwap",
+            sink=vwap_sink,
+            column_names=VWAP_COLUMNS,
+            spool=spool,
+        )
+        self.footprint_writer = ColumnarBatchWriter(
+            name="FootprintTicker.footprint",
+            sink=footprint_sink,
+            column_names=FOOTPRINT_COLUMNS,
+            spool=spool,
+        )
+
+    # ==========================================================
+    # SYMBOLS
+    # ==========================================================
+
+    def grow(self, count: int):
+
+        new = count - self.size
+        if new <= 0:
+            return
+
+        zeros_d = array("d", bytes(8 * new))
+        zeros_q = array("q", bytes(8 * new))
+
+        self.base.extend(zeros_q)
+        self.lo.extend(array("q", [1]) * new)
+        self.hi.extend(zeros_q)
+        self.minute_notional.extend(zeros_d)
+        self.minute_volume.extend(zeros_q)
+        self.atp.extend(zeros_d)
+
+        # bins are allocated on a symbol's first trade
+        self.bin_buy.extend(array("q") for _ in range(new))
+        self.bin_sell.extend(array("q") for _ in range(new))
+
+        self.size = count
+
+    def state_columns(self) -> List[array]:
+        # the bins follow as open_bins(); base is re-derived on restore
+        return [self.lo, self.hi, self.minute_notional, self.minute_volume, self.atp]
+
+    def open_bins(self) -> bytes:
+
+        # the open minute's touched levels, buy then sell; spans follow lo/hi
+        return b"".join(
+            bins[sid][lo - base : hi - base + 1].tobytes()
+            for sid, (base, lo, hi) in enumerate(zip(self.base, self.lo, self.hi))
+            if hi >= lo
+            for bins in (self.bin_buy, self.bin_sell)
+        )
+
+    def restore_bins(self, data: bytes, count: int):
+
+        # after state_columns() were filled from the snapshot
+        self.base.extend(array("q", bytes(8 * count)))
+        self.bin_buy.extend(array("q") for _ in range(count))
+        self.bin_sell.extend(array("q") for _ in range(count))
+        self.size = count
+
+        margin = self.GROW_MARGIN
+        offset = 0
+
+        for sid in range(count):
+
+            lo = self.lo[sid]
+            hi = self.hi[sid]
+            if hi < lo:
+                continue
+
+            self.base[sid] = lo - margin
+            size = 8 * (hi - lo + 1)
+
+            for bins in (self.bin_buy, self.bin_sell):
+                window = array("q", bytes(8 * margin))
+                window.frombytes(data[offset : offset + size])
+                window.extend(array("q", bytes(8 * margin)))
+                bins[sid] = window
+                offset += size
+
+    # ==========================================================
+    # TICKS
+    # ==========================================================
+
+    def _fit(self, sid: int, level: int) -> int:
+
+        base = self.base[sid]
+        buy = self.bin_buy[sid]
+        size = len(buy)
+
+        if self.hi[sid] < self.lo[sid]:
+            # empty minute: move the window instead of growing it
+            if not size:
+                size = self.INITIAL_BINS
+                self.bin_buy[sid] = array("q", bytes(8 * size))
+                self.bin_sell[sid] = array("q", bytes(8 * size))
+            base = self.base[sid] = level - size // 2
+            return level - base
+
+        start = min(base, level - self.GROW_MARGIN)
+        end = max(base + size, level + 1 + self.GROW_MARGIN)
+        offset = base - start
+
+        for bins in (self.bin_buy, self.bin_sell):
+            old = bins[sid]
+            grown = array("q", bytes(8 * (end - start)))
+            grown[offset : offset + size] = old
+            bins[sid] = grown
+
+        self.base[sid] = start
+        return level - start
+
+    def add(self, sid: int, ltp: float, volume: int, direction: int):
+
+        level = int(ltp / self.TICK + 0.5)
+
+        i = level - self.base[sid]
+        if not 0 <= i < len(self.bin_buy[sid]):
+            i = self._fit(sid, level)
+
+        if direction == Direction.buy:
+            self.bin_buy[sid][i] += volume
+        elif direction == Direction.sell:
+            self.bin_sell[sid][i] += volume
+
+        if level < self.lo[sid] or self.hi[sid] < self.lo[sid]:
+            self.lo[sid] = level
+        if level > self.hi[sid]:
+            self.hi[sid] = level
+
+        self.minute_notional[sid] += ltp * volume
+        self.minute_volume[sid] += volume
+
+    def update_session(self, sids: Sequence[int], atps: Sequence[float]):
+
+        state_atp = self.atp
+        for sid, atp in zip(sids, atps):
+            if atp:
+                state_atp[sid] = atp
+
+    # ==========================================================
+    # EMIT
+    # ==========================================================
+
+    def emit_minute(self, symbols: Sequence[str], sid: int, minute: int):
+
+        volume = self.minute_volume[sid]
+        if not volume:
+            return
+
+        symbol = symbols[sid]
+        timestamp = ISDateTime.from_timestamp(minute * 60000)
+
+        self.vwap_writer.append(
+            (
+                symbol,
+                timestamp,
+                self.minute_notional[sid] / volume,
+                self.atp[sid],
+                volume,
+            )
+        )
+
+        lo = self.lo[sid]
+        hi = self.hi[sid]
+        base = self.base[sid]
+        buy = self.bin_buy[sid]
+        sell = self.bin_sell[sid]
+        tick = self.TICK
+        append = self.footprint_writer.append
+
+        for i in range(lo - base, hi - base + 1):
+            if buy[i] or sell[i]:
+                append((symbol, timestamp, round((base + i) * tick, 2), buy[i], sell[i]))
+
+        # zero only the touched levels; the window is reused next minute
+        span = hi - lo + 1
+        buy[lo - base : hi - base + 1] = array("q", bytes(8 * span))
+        sell[lo - base : hi - base + 1] = array("q", bytes(8 * span))
+
+        self.lo[sid] = 1
+        self.hi[sid] = 0
+        self.minute_notional[sid] = 0.0
+        self.minute_volume[sid] = 0
+
+    def request_flush(self):
+        self.vwap_writer.request_flush()
+        self.footprint_writer.request_flush()
+
+    async def close(self):
+        await self.vwap_writer.close()
+        await self.footprint_writer.close()
@@ -0,0 +1,267 @@
+import json
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from server.utils.logger import log
+
+
+SEGMENT_MAGIC = b"MBFRAME1"
+
+# payload length, monotonic receive time (ns)
+RECORD_HEADER = struct.Struct("<IQ")
+
+SEGMENT_PREFIX = "frames-"
+SEGMENT_SUFFIX = ".seg"
+INSTRUMENTS_FILE = "instruments.json"
+
+
+def _segment_name(index: int) -> str:
+    return f"{SEGMENT_PREFIX}{index:06d}{SEGMENT_SUFFIX}"
+
+
+def list_segments(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+
+    names = sorted(
+        name
+        for name in os.listdir(directory)
+        if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+    )
+    return [os.path.join(directory, name) for name in names]
+
+
+class FrameJournalWriter:
+    """Appends raw feed frames to size-rotated segment files.
+
+    The receive loop only enqueues; a writer thread owns the files, so disk
+    latency never stalls ``ws.recv()``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 256 * 1024 * 1024,
+        queue_size: int = 100000,
+    ):
+
+        self.directory = directory
+        self.segment_size = segment_size
+
+        os.makedirs(directory, exist_ok=True)
+
+        existing = list_segments(directory)
+        self._segment_index = (
+            int(os.path.basename(existing[-1])[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)])
+            + 1
+            if existing
+            else 1
+        )
+
+        self._queue: queue.Queue[Tuple[int, bytes] | None] = queue.Queue(
+            maxsize=queue_size
+        )
+
+        self.frames_written = 0
+        self.bytes_written = 0
+        self.frames_dropped = 0
+
+        self._file = None
+        self._file_size = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="frame-journal", daemon=True
+        )
+        self._thread.start()
+
+        log.info(f"[FrameJournalWriter] capturing frames to {directory}")
+
+    # ==========================================================
+    # APPEND (receive path)
+    # ==========================================================
+
+    def append(self, frame: bytes) -> None:
+
+        try:
+            self._queue.put_nowait((time.monotonic_ns(), frame))
+
+        except queue.Full:
+            if self.frames_dropped == 0:
+                log.error("[FrameJournalWriter.append] buffer full, dropping frames")
+            self.frames_dropped += 1
+
+    def write_instruments(self, instrument_to_symbol: Dict[str, str]) -> None:
+
+        path = os.path.join(self.directory, INSTRUMENTS_FILE)
+
+        instruments: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                instruments = json.load(f)
+
+        instruments.update(instrument_to_symbol)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(instruments, f)
+        os.replace(tmp_path, path)
+
+    # ==========================================================
+    # WRITER THREAD
+    # ==========================================================
+
+    def _open_segment(self):
+
+        path = os.path.join(self.directory, _segment_name(self._segment_index))
+        self._segment_index += 1
+
+        self._file = open(path, "wb", buffering=1024 * 1024)
+        self._file.write(SEGMENT_MAGIC)
+        self._file_size = len(SEGMENT_MAGIC)
+
+    def _close_segment(self):
+
+        if self._file is None:
+            return
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    def _run(self):
+
+        pack = RECORD_HEADER.pack
+        header_size = RECORD_HEADER.size
+
+        while True:
+
+            try:
+                item = self._queue.get(timeout=1)
+            except queue.Empty:
+                # idle → make what we have visible to readers
+                if self._file is not None:
+                    self._file.flush()
+                continue
+
+            if item is None:
+                break
+
+            received_ns, frame = item
+            record_size = header_size + len(frame)
+
+            try:
+
+                if self._file is None or (
+                    self._file_size + record_size > self.segment_size
+                    and self._file_size > len(SEGMENT_MAGIC)
+                ):
+                    self._close_segment()
+                    self._open_segment()
+
+                self._file.write(pack(len(frame), received_ns))  # type: ignore
+                self._file.write(frame)  # type: ignore
+
+                self._file_size += record_size
+                self.frames_written += 1
+                self.bytes_written += record_size
+
+            except OSError as e:
+                log.error(f"[FrameJournalWriter._run] write failed: {e}")
+                self.frames_dropped += 1
+
+        self._close_segment()
+
+    # ==========================================================
+    # CLOSE
+    # ==========================================================
+
+    def close(self):
+
+        self._queue.put(None)
+        self._thread.join()
+
+        log.info(
+            f"[FrameJournalWriter.close] frames={self.frames_written} "
+            f"bytes={self.bytes_written} dropped={self.frames_dropped}"
+        )
+
+
+class FrameJournalReader:
+    """Walks captured frames straight out of mmapped segments.
+
+    Yielded payloads are memoryviews into the mapping and are released once
+    the iterator advances, so copy them if they must outlive the loop body.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.segments = list_segments(directory)
+
+    def read_instruments(self) -> Dict[str, str]:
+
+        path = os.path.join(self.directory, INSTRUMENTS_FILE)
+
+        if not os.path.exists(path):
+            return {}
+
+        with open(path) as f:
+            return json.load(f)
+
+    def frames(self) -> Iterator[Tuple[int, memoryview]]:
+
+        for path in self.segments:
+            yield from self._segment_frames(path)
+
+    @staticmethod
+    def _segment_frames(path: str) -> Iterator[Tuple[int, memoryview]]:
+
+        if os.path.getsize(path) <= len(SEGMENT_MAGIC):
+            return
+
+        unpack_from = RECORD_HEADER.unpack_from
+        header_size = RECORD_HEADER.size
+
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+
+            if mm[: len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+                log.warning(f"[FrameJournalReader] {path} is not a frame segment")
+                return
+
+            view = memoryview(mm)
+            end = len(mm)
+            offset = len(SEGMENT_MAGIC)
+
+            try:
+
+                while offset + header_size <= end:
+
+                    length, received_ns = unpack_from(mm, offset)
+                    offset += header_size
+
+                    if offset + length > end:
+                        # torn tail from an unclean shutdown
+                        log.warning(f"[FrameJournalReader] truncated record in {path}")
+                        break
+
+                    frame = view[offset : offset + length]
+                    offset += length
+
+                    try:
+                        yield received_ns, frame
+                    finally:
+                        frame.release()
+
+            finally:
+                view.release()
+
+        finally:
+            mm.close()
@@ -0,0 +1,168 @@
+from array import array
+from typing import Dict, Iterable, List, Sequence
+
+from server.modules.ticker.minute_ticker import MinuteTicker
+from server.modules.ticker.ohlc_ticker import OhlcTicker
+from server.utils.logger import log
+
+
+class IndexTicker(MinuteTicker):
+    """Minute OHLC for indices, built from ltpc alone (indices have no vtt).
+
+    Kept apart from VolumeTicker so the stock path pays nothing for it;
+    candles go out through the shared OhlcTicker with volume 0.
+    """
+
+    # IndexFullFeed fields read from each tick
+    FEED_FIELDS = frozenset({"ltpc"})
+
+    def __init__(
+        self,
+        ohlc: OhlcTicker,
+    ):
+
+        self.ohlc = ohlc
+
+        self.symbols: List[str] = []
+        self.symbol_ids: Dict[str, int] = {}
+
+        # per-index state, indexed by symbol id; ltt == 0 means no tick yet
+        self.minute = array("q")
+        self.ltt = array("q")
+        # 1 while the index's minute bar holds ticks not yet emitted
+        self.open = array("b")
+        self.bar_open = array("d")
+        self.bar_high = array("d")
+        self.bar_low = array("d")
+        self.bar_close = array("d")
+
+        # minutes are closed by Ticker's sweeper, with the other tickers'
+        self.closed_minute = 0
+
+        log.info("[IndexTicker] initialized")
+
+    # ==========================================================
+    # SYMBOLS
+    # ==========================================================
+
+    def register(self, symbols: Iterable[str]) -> List[int]:
+
+        ids = []
+        new = 0
+
+        for symbol in symbols:
+            sid = self.symbol_ids.get(symbol)
+            if sid is None:
+                sid = len(self.symbols)
+                self.symbol_ids[symbol] = sid
+                self.symbols.append(symbol)
+                new += 1
+            ids.append(sid)
+
+        if new:
+            zeros_d = array("d", bytes(8 * new))
+            zeros_q = array("q", bytes(8 * new))
+
+            self.minute.extend(zeros_q)
+            self.ltt.extend(zeros_q)
+            self.open.extend(array("b", bytes(new)))
+            self.bar_open.extend(zeros_d)
+            self.bar_high.extend(zeros_d)
+            self.bar_low.extend(zeros_d)
+            self.bar_close.extend(zeros_d)
+
+        return ids
+
+    # ==========================================================
+    # EMIT
+    # ==========================================================
+
+    def emit_minute(self, sid: int):
+
+        self.ohlc.emit(
+            self.symbols[sid],
+            self.minute[sid],
+            self.bar_open[sid],
+            self.bar_high[sid],
+            self.bar_low[sid],
+            self.bar_close[sid],
+            0,
+        )
+
+    # ==========================================================
+    # PROCESS TICKS
+    # ==========================================================
+
+    def process_ticks(
+        self,
+        sids: Sequence[int],
+        ltps: Sequence[float],
+        ltts: Sequence[int],
+    ) -> int:
+
+        state_minute = self.minute
+        state_ltt = self.ltt
+        state_open = self.open
+        bar_open = self.bar_open
+        bar_high = self.bar_high
+        bar_low = self.bar_low
+        bar_close = self.bar_close
+        closed_minute = self.closed_minute
+
+        emitted = 0
+
+        for sid, ltp, ltt in zip(sids, ltps, ltts):
+
+            # repeated or older tick
+            if ltt <= state_ltt[sid]:
+                continue
+            state_ltt[sid] = ltt
+
+            minute = ltt // 60000
+            if minute <= closed_minute:
+                minute = closed_minute + 1
+
+            if minute != state_minute[sid] or not state_open[sid]:
+
+                if state_open[sid]:
+                    self.emit_minute(sid)
+                    emitted += 1
+
+                state_minute[sid] = minute
+                state_open[sid] = 1
+                bar_open[sid] = bar_high[sid] = bar_low[sid] = bar_close[sid] = ltp
+                continue
+
+            if ltp > bar_high[sid]:
+                bar_high[sid] = ltp
+            elif ltp < bar_low[sid]:
+                bar_low[sid] = ltp
+            bar_close[sid] = ltp
+
+        return emitted
+
+    # ==========================================================
+    # MINUTE SWEEP
+    # ==========================================================
+
+    def close_minutes(self, before_minute: int) -> int:
+
+        emitted = self.close_open_minutes(len(self.symbols), before_minute)
+
+        if emitted:
+            self.ohlc.request_flush()
+
+        return emitted
+
+    # ==========================================================
+    # DISPOSE
+    # ==========================================================
+
+    async def dispose(self):
+
+        log.info("[IndexTicker.dispose] started")
+
+        # the shared OhlcTicker writer is closed by its owner
+        self.close_minutes(2**62)
+
+        log.info("[IndexTicker.dispose] stopped")
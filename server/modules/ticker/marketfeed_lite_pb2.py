@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketfeed_lite.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x15marketfeed_lite.proto\x12\x31\x63om.upstox.marketdatafeederv3udapi.rpc.proto.lite\"9\n\x04LTPC\x12\x0b\n\x03ltp\x18\x01 \x01(\x01\x12\x0b\n\x03ltt\x18\x02 \x01(\x03\x12\x0b\n\x03ltq\x18\x03 \x01(\x03\x12\n\n\x02\x63p\x18\x04 \x01(\x01\"\xa3\x01\n\x0eMarketFullFeed\x12\x45\n\x04ltpc\x18\x01 \x01(\x0b\x32\x37.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.LTPC\x12\x0b\n\x03\x61tp\x18\x05 \x01(\x01\x12\x0b\n\x03vtt\x18\x06 \x01(\x03\x12\n\n\x02oi\x18\x07 \x01(\x01\x12\n\n\x02iv\x18\x08 \x01(\x01\x12\x0b\n\x03tbq\x18\t \x01(\x01\x12\x0b\n\x03tsq\x18\n \x01(\x01\"?\n\x05Quote\x12\x0c\n\x04\x62idQ\x18\x01 \x01(\x03\x12\x0c\n\x04\x62idP\x18\x02 \x01(\x01\x12\x0c\n\x04\x61skQ\x18\x03 \x01(\x03\x12\x0c\n\x04\x61skP\x18\x04 \x01(\x01\"\\\n\x0bMarketLevel\x12M\n\x0b\x62idAskQuote\x18\x01 \x03(\x0b\x32\x38.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.Quote\"\xfd\x01\n\x13\x44\x65pthMarketFullFeed\x12\x45\n\x04ltpc\x18\x01 \x01(\x0b\x32\x37.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.LTPC\x12S\n\x0bmarketLevel\x18\x02 \x01(\x0b\x32>.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.MarketLevel\x12\x0b\n\x03\x61tp\x18\x05 \x01(\x01\x12\x0b\n\x03vtt\x18\x06 \x01(\x03\x12\n\n\x02oi\x18\x07 \x01(\x01\x12\n\n\x02iv\x18\x08 \x01(\x01\x12\x0b\n\x03tbq\x18\t \x01(\x01\x12\x0b\n\x03tsq\x18\n \x01(\x01\"V\n\rIndexFullFeed\x12\x45\n\x04ltpc\x18\x01 \x01(\x0b\x32\x37.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.LTPC\"\xc7\x01\n\x08\x46ullFeed\x12U\n\x08marketFF\x18\x01 \x01(\x0b\x32\x41.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.MarketFullFeedH\x00\x12S\n\x07indexFF\x18\x02 \x01(\x0b\x32@.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.IndexFullFeedH\x00\x42\x0f\n\rFullFeedUnion\"d\n\x04\x46\x65\x65\x64\x12O\n\x08\x66ullFeed\x18\x02 \x01(\x0b\x32;.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.FullFeedH\x00\x42\x0b\n\tFeedUnion\"\xd1\x01\n\rDepthFullFeed\x12Z\n\x08marketFF\x18\x01 \x01(\x0b\x32\x46.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.DepthMarketFullFeedH\x00\x12S\n\x07indexFF\x18\x02 \x01(\x0b\x32@.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.IndexFullFeedH\x00\x42\x0f\n\rFullFeedUnion\"n\n\tDepthFeed\x12T\n\x08\x66ullFeed\x18\x02 \x01(\x0b\x32@.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.DepthFullFeedH\x00\x42\x0b\n\tFeedUnion\"\xec\x01\n\nMarketInfo\x12g\n\rsegmentStatus\x18\x01 \x03(\x0b\x32P.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.MarketInfo.SegmentStatusEntry\x1au\n\x12SegmentStatusEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12N\n\x05value\x18\x02 \x01(\x0e\x32?.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.MarketStatus:\x02\x38\x01\"\xfd\x02\n\x0c\x46\x65\x65\x64Response\x12\x45\n\x04type\x18\x01 \x01(\x0e\x32\x37.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.Type\x12Y\n\x05\x66\x65\x65\x64s\x18\x02 \x03(\x0b\x32J.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.FeedResponse.FeedsEntry\x12\x11\n\tcurrentTs\x18\x03 \x01(\x03\x12Q\n\nmarketInfo\x18\x04 \x01(\x0b\x32=.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.MarketInfo\x1a\x65\n\nFeedsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x46\n\x05value\x18\x02 \x01(\x0b\x32\x37.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.Feed:\x02\x38\x01\"\x8c\x03\n\x11\x44\x65pthFeedResponse\x12\x45\n\x04type\x18\x01 \x01(\x0e\x32\x37.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.Type\x12^\n\x05\x66\x65\x65\x64s\x18\x02 \x03(\x0b\x32O.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.DepthFeedResponse.FeedsEntry\x12\x11\n\tcurrentTs\x18\x03 \x01(\x03\x12Q\n\nmarketInfo\x18\x04 \x01(\x0b\x32=.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.MarketInfo\x1aj\n\nFeedsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12K\n\x05value\x18\x02 \x01(\x0b\x32<.com.upstox.marketdatafeederv3udapi.rpc.proto.lite.DepthFeed:\x02\x38\x01*8\n\x04Type\x12\x10\n\x0cinitial_feed\x10\x00\x12\r\n\tlive_feed\x10\x01\x12\x0f\n\x0bmarket_info\x10\x02*{\n\x0cMarketStatus\x12\x12\n\x0ePRE_OPEN_START\x10\x00\x12\x10\n\x0cPRE_OPEN_END\x10\x01\x12\x0f\n\x0bNORMAL_OPEN\x10\x02\x12\x10\n\x0cNORMAL_CLOSE\x10\x03\x12\x11\n\rCLOSING_START\x10\x04\x12\x0f\n\x0b\x43LOSING_END\x10\x05\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketfeed_lite_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _MARKETINFO_SEGMENTSTATUSENTRY._options = None
+  _MARKETINFO_SEGMENTSTATUSENTRY._serialized_options = b'8\001'
+  _FEEDRESPONSE_FEEDSENTRY._options = None
+  _FEEDRESPONSE_FEEDSENTRY._serialized_options = b'8\001'
+  _DEPTHFEEDRESPONSE_FEEDSENTRY._options = None
+  _DEPTHFEEDRESPONSE_FEEDSENTRY._serialized_options = b'8\001'
+  _TYPE._serialized_start=2454
+  _TYPE._serialized_end=2510
+  _MARKETSTATUS._serialized_start=2512
+  _MARKETSTATUS._serialized_end=2635
+  _LTPC._serialized_start=76
+  _LTPC._serialized_end=133
+  _MARKETFULLFEED._serialized_start=136
+  _MARKETFULLFEED._serialized_end=299
+  _QUOTE._serialized_start=301
+  _QUOTE._serialized_end=364
+  _MARKETLEVEL._serialized_start=366
+  _MARKETLEVEL._serialized_end=458
+  _DEPTHMARKETFULLFEED._serialized_start=461
+  _DEPTHMARKETFULLFEED._serialized_end=714
+  _INDEXFULLFEED._serialized_start=716
+  _INDEXFULLFEED._serialized_end=802
+  _FULLFEED._serialized_start=805
+  _FULLFEED._serialized_end=1004
+  _FEED._serialized_start=1006
+  _FEED._serialized_end=1106
+  _DEPTHFULLFEED._serialized_start=1109
+  _DEPTHFULLFEED._serialized_end=1318
+  _DEPTHFEED._serialized_start=1320
+  _DEPTHFEED._serialized_end=1430
+  _MARKETINFO._serialized_start=1433
+  _MARKETINFO._serialized_end=1669
+  _MARKETINFO_SEGMENTSTATUSENTRY._serialized_start=1552
+  _MARKETINFO_SEGMENTSTATUSENTRY._serialized_end=1669
+  _FEEDRESPONSE._serialized_start=1672
+  _FEEDRESPONSE._serialized_end=2053
+  _FEEDRESPONSE_FEEDSENTRY._serialized_start=1952
+  _FEEDRESPONSE_FEEDSENTRY._serialized_end=2053
+  _DEPTHFEEDRESPONSE._serialized_start=2056
+  _DEPTHFEEDRESPONSE._serialized_end=2452
+  _DEPTHFEEDRESPONSE_FEEDSENTRY._serialized_start=2346
+  _DEPTHFEEDRESPONSE_FEEDSENTRY._serialized_end=2452
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,175 @@
+from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Mapping, Optional as _Optional, Union as _Union
+
+CLOSING_END: MarketStatus
+CLOSING_START: MarketStatus
+DESCRIPTOR: _descriptor.FileDescriptor
+NORMAL_CLOSE: MarketStatus
+NORMAL_OPEN: MarketStatus
+PRE_OPEN_END: MarketStatus
+PRE_OPEN_START: MarketStatus
+initial_feed: Type
+live_feed: Type
+market_info: Type
+
+class DepthFeed(_message.Message):
+    __slots__ = ["fullFeed"]
+    FULLFEED_FIELD_NUMBER: _ClassVar[int]
+    fullFeed: DepthFullFeed
+    def __init__(self, fullFeed: _Optional[_Union[DepthFullFeed, _Mapping]] = ...) -> None: ...
+
+class DepthFeedResponse(_message.Message):
+    __slots__ = ["currentTs", "feeds", "marketInfo", "type"]
+    class FeedsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: DepthFeed
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[_Union[DepthFeed, _Mapping]] = ...) -> None: ...
+    CURRENTTS_FIELD_NUMBER: _ClassVar[int]
+    FEEDS_FIELD_NUMBER: _ClassVar[int]
+    MARKETINFO_FIELD_NUMBER: _ClassVar[int]
+    TYPE_FIELD_NUMBER: _ClassVar[int]
+    currentTs: int
+    feeds: _containers.MessageMap[str, DepthFeed]
+    marketInfo: MarketInfo
+    type: Type
+    def __init__(self, type: _Optional[_Union[Type, str]] = ..., feeds: _Optional[_Mapping[str, DepthFeed]] = ..., currentTs: _Optional[int] = ..., marketInfo: _Optional[_Union[MarketInfo, _Mapping]] = ...) -> None: ...
+
+class DepthFullFeed(_message.Message):
+    __slots__ = ["indexFF", "marketFF"]
+    INDEXFF_FIELD_NUMBER: _ClassVar[int]
+    MARKETFF_FIELD_NUMBER: _ClassVar[int]
+    indexFF: IndexFullFeed
+    marketFF: DepthMarketFullFeed
+    def __init__(self, marketFF: _Optional[_Union[DepthMarketFullFeed, _Mapping]] = ..., indexFF: _Optional[_Union[IndexFullFeed, _Mapping]] = ...) -> None: ...
+
+class DepthMarketFullFeed(_message.Message):
+    __slots__ = ["atp", "iv", "ltpc", "marketLevel", "oi", "tbq", "tsq", "vtt"]
+    ATP_FIELD_NUMBER: _ClassVar[int]
+    IV_FIELD_NUMBER: _ClassVar[int]
+    LTPC_FIELD_NUMBER: _ClassVar[int]
+    MARKETLEVEL_FIELD_NUMBER: _ClassVar[int]
+    OI_FIELD_NUMBER: _ClassVar[int]
+    TBQ_FIELD_NUMBER: _ClassVar[int]
+    TSQ_FIELD_NUMBER: _ClassVar[int]
+    VTT_FIELD_NUMBER: _ClassVar[int]
+    atp: float
+    iv: float
+    ltpc: LTPC
+    marketLevel: MarketLevel
+    oi: float
+    tbq: float
+    tsq: float
+    vtt: int
+    def __init__(self, ltpc: _Optional[_Union[LTPC, _Mapping]] = ..., marketLevel: _Optional[_Union[MarketLevel, _Mapping]] = ..., atp: _Optional[float] = ..., vtt: _Optional[int] = ..., oi: _Optional[float] = ..., iv: _Optional[float] = ..., tbq: _Optional[float] = ..., tsq: _Optional[float] = ...) -> None: ...
+
+class Feed(_message.Message):
+    __slots__ = ["fullFeed"]
+    FULLFEED_FIELD_NUMBER: _ClassVar[int]
+    fullFeed: FullFeed
+    def __init__(self, fullFeed: _Optional[_Union[FullFeed, _Mapping]] = ...) -> None: ...
+
+class FeedResponse(_message.Message):
+    __slots__ = ["currentTs", "feeds", "marketInfo", "type"]
+    class FeedsEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: Feed
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[_Union[Feed, _Mapping]] = ...) -> None: ...
+    CURRENTTS_FIELD_NUMBER: _ClassVar[int]
+    FEEDS_FIELD_NUMBER: _ClassVar[int]
+    MARKETINFO_FIELD_NUMBER: _ClassVar[int]
+    TYPE_FIELD_NUMBER: _ClassVar[int]
+    currentTs: int
+    feeds: _containers.MessageMap[str, Feed]
+    marketInfo: MarketInfo
+    type: Type
+    def __init__(self, type: _Optional[_Union[Type, str]] = ..., feeds: _Optional[_Mapping[str, Feed]] = ..., currentTs: _Optional[int] = ..., marketInfo: _Optional[_Union[MarketInfo, _Mapping]] = ...) -> None: ...
+
+class FullFeed(_message.Message):
+    __slots__ = ["indexFF", "marketFF"]
+    INDEXFF_FIELD_NUMBER: _ClassVar[int]
+    MARKETFF_FIELD_NUMBER: _ClassVar[int]
+    indexFF: IndexFullFeed
+    marketFF: MarketFullFeed
+    def __init__(self, marketFF: _Optional[_Union[MarketFullFeed, _Mapping]] = ..., indexFF: _Optional[_Union[IndexFullFeed, _Mapping]] = ...) -> None: ...
+
+class IndexFullFeed(_message.Message):
+    __slots__ = ["ltpc"]
+    LTPC_FIELD_NUMBER: _ClassVar[int]
+    ltpc: LTPC
+    def __init__(self, ltpc: _Optional[_Union[LTPC, _Mapping]] = ...) -> None: ...
+
+class LTPC(_message.Message):
+    __slots__ = ["cp", "ltp", "ltq", "ltt"]
+    CP_FIELD_NUMBER: _ClassVar[int]
+    LTP_FIELD_NUMBER: _ClassVar[int]
+    LTQ_FIELD_NUMBER: _ClassVar[int]
+    LTT_FIELD_NUMBER: _ClassVar[int]
+    cp: float
+    ltp: float
+    ltq: int
+    ltt: int
+    def __init__(self, ltp: _Optional[float] = ..., ltt: _Optional[int] = ..., ltq: _Optional[int] = ..., cp: _Optional[float] = ...) -> None: ...
+
+class MarketFullFeed(_message.Message):
+    __slots__ = ["atp", "iv", "ltpc", "oi", "tbq", "tsq", "vtt"]
+    ATP_FIELD_NUMBER: _ClassVar[int]
+    IV_FIELD_NUMBER: _ClassVar[int]
+    LTPC_FIELD_NUMBER: _ClassVar[int]
+    OI_FIELD_NUMBER: _ClassVar[int]
+    TBQ_FIELD_NUMBER: _ClassVar[int]
+    TSQ_FIELD_NUMBER: _ClassVar[int]
+    VTT_FIELD_NUMBER: _ClassVar[int]
+    atp: float
+    iv: float
+    ltpc: LTPC
+    oi: float
+    tbq: float
+    tsq: float
+    vtt: int
+    def __init__(self, ltpc: _Optional[_Union[LTPC, _Mapping]] = ..., atp: _Optional[float] = ..., vtt: _Optional[int] = ..., oi: _Optional[float] = ..., iv: _Optional[float] = ..., tbq: _Optional[float] = ..., tsq: _Optional[float] = ...) -> None: ...
+
+class MarketInfo(_message.Message):
+    __slots__ = ["segmentStatus"]
+    class SegmentStatusEntry(_message.Message):
+        __slots__ = ["key", "value"]
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: MarketStatus
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[_Union[MarketStatus, str]] = ...) -> None: ...
+    SEGMENTSTATUS_FIELD_NUMBER: _ClassVar[int]
+    segmentStatus: _containers.ScalarMap[str, MarketStatus]
+    def __init__(self, segmentStatus: _Optional[_Mapping[str, MarketStatus]] = ...) -> None: ...
+
+class MarketLevel(_message.Message):
+    __slots__ = ["bidAskQuote"]
+    BIDASKQUOTE_FIELD_NUMBER: _ClassVar[int]
+    bidAskQuote: _containers.RepeatedCompositeFieldContainer[Quote]
+    def __init__(self, bidAskQuote: _Optional[_Iterable[_Union[Quote, _Mapping]]] = ...) -> None: ...
+
+class Quote(_message.Message):
+    __slots__ = ["askP", "askQ", "bidP", "bidQ"]
+    ASKP_FIELD_NUMBER: _ClassVar[int]
+    ASKQ_FIELD_NUMBER: _ClassVar[int]
+    BIDP_FIELD_NUMBER: _ClassVar[int]
+    BIDQ_FIELD_NUMBER: _ClassVar[int]
+    askP: float
+    askQ: int
+    bidP: float
+    bidQ: int
+    def __init__(self, bidQ: _Optional[int] = ..., bidP: _Optional[float] = ..., askQ: _Optional[int] = ..., askP: _Optional[float] = ...) -> None: ...
+
+class Type(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = []
+
+class MarketStatus(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = []
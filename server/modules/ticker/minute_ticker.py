@@ -0,0 +1,37 @@
+from array import array
+
+
+class MinuteTicker:
+    """Open-minute bookkeeping shared by the tickers that build per-symbol
+    minute rows (VolumeTicker, IndexTicker, BookTicker).
+
+    Subclasses keep ``open`` / ``minute`` columns indexed by symbol id and
+    implement ``emit_minute``; ``closed_minute`` is the boundary late ticks
+    are folded past.
+    """
+
+    open: array
+    minute: array
+    closed_minute: int
+
+    def emit_minute(self, sid: int):
+        raise NotImplementedError
+
+    def close_open_minutes(self, count: int, before_minute: int) -> int:
+
+        state_open = self.open
+        state_minute = self.minute
+        emit_minute = self.emit_minute
+        emitted = 0
+
+        for sid in range(count):
+
+            if state_open[sid] and state_minute[sid] < before_minute:
+                emit_minute(sid)
+                state_open[sid] = 0
+                emitted += 1
+
+        if before_minute - 1 > self.closed_minute:
+            self.closed_minute = before_minute - 1
+
+        return emitted
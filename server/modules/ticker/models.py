@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
+from typing import Protocol
 
 
 @dataclass(slots=True)
@@ -15,29 +16,19 @@ class OhlcModel:
     # oi: int = 0
 
 
-class Direction(Enum):
-    neutral = "neutral"
-    buy = "buy"
-    sell = "sell"
+class Direction(IntEnum):
+    neutral = 0
+    buy = 1
+    sell = -1
 
 
-@dataclass(slots=True, kw_only=True)
-class VolumeDetailModel:
-    symbol: str
-    direction: Direction = Direction.neutral
-    ltt: datetime
-    vtt: int
-    ltp: float
-    minute_buy_vol: int = 0
-    minute_sell_vol: int = 0
-    minute_total_vol: int = 0
-
+class RowSink(Protocol):
+    table_name: str
 
-@dataclass(slots=True, kw_only=True)
-class VolumeDeltaModel:
-    timestamp: datetime
-    symbol: str
-    buy: int
-    sell: int
-    total: int
-    delta: int
+    async def insert(
+        self,
+        rows: list,
+        column_names: list,
+        column_oriented: bool = False,
+        dedup_token: str | None = None,
+    ): ...
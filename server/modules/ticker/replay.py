@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import csv
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List
+
+import server.modules.ticker.marketfeed_pb2 as pb
+from server.db import clickhouse_client
+from server.db.tables import Tables
+from server.modules.ticker.feed_processor import FeedProcessor
+from server.modules.ticker.frame_journal import FrameJournalReader
+from server.modules.ticker.models import RowSink
+from server.modules.ticker.volume_ticker_clickhouse import VolumeTicker
+from server.utils.is_dt import ISDateTime
+from server.utils.logger import log
+
+
+# ==========================================================
+# SINKS
+# ==========================================================
+
+
+class NullSink:
+
+    def __init__(self):
+        self.table_name = "null"
+
+    async def insert(
+        self,
+        rows: list,
+        column_names: list,
+        column_oriented: bool = False,
+        dedup_token: str | None = None,
+    ):
+        pass
+
+
+class MemorySink:
+
+    def __init__(self):
+        self.table_name = "memory"
+        self.column_names: list = []
+        self.rows: list = []
+
+    async def insert(
+        self,
+        rows: list,
+        column_names: list,
+        column_oriented: bool = False,
+        dedup_token: str | None = None,
+    ):
+        self.column_names = column_names
+        self.rows.extend(zip(*rows) if column_oriented else rows)
+
+
+class FileSink:
+
+    def __init__(self, path: str):
+        self.table_name = path
+        self.path = path
+        self._header_written = False
+
+    async def insert(
+        self,
+        rows: list,
+        column_names: list,
+        column_oriented: bool = False,
+        dedup_token: str | None = None,
+    ):
+
+        with open(self.path, "a", newline="") as f:
+            writer = csv.writer(f)
+            if not self._header_written:
+                writer.writerow(column_names)
+                self._header_written = True
+            writer.writerows(zip(*rows) if column_oriented else rows)
+
+
+# ==========================================================
+# REPORT
+# ==========================================================
+
+
+def percentile(sorted_values: List[int], q: float) -> int:
+
+    if not sorted_values:
+        return 0
+
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+@dataclass(slots=True)
+class ReplayReport:
+    frames: int = 0
+    ticks: int = 0
+    elapsed_s: float = 0.0
+    frames_per_s: float = 0.0
+    ticks_per_s: float = 0.0
+    latency_us: Dict[str, float] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        latency = " ".join(f"{k}={v:.1f}" for k, v in self.latency_us.items())
+        return (
+            f"frames={self.frames} ticks={self.ticks} elapsed={self.elapsed_s:.2f}s "
+            f"frames/s={self.frames_per_s:.0f} ticks/s={self.ticks_per_s:.0f} "
+            f"latency_us[{latency}]"
+        )
+
+
+# ==========================================================
+# ENGINE
+# ==========================================================
+
+
+class ReplayEngine:
+    """Drives captured frames through the live FeedProcessor path.
+
+    ``speed=0`` replays as fast as possible, otherwise the recorded receive
+    spacing is compressed by ``speed`` (2.0 = twice real time).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sink: RowSink,
+        speed: float = 0.0,
+        instrument_to_symbol: Dict[str, str] | None = None,
+        trade_rule: str = "tick",
+    ):
+
+        self.reader = FrameJournalReader(directory)
+        self.sink = sink
+        self.speed = speed
+        self.trade_rule = trade_rule
+        self.instrument_to_symbol = (
+            instrument_to_symbol or self.reader.read_instruments()
+        )
+
+    def _session_date(self):
+
+        obj = pb.FeedResponse()
+
+        for _, frame in self.reader.frames():
+            obj.ParseFromString(frame)
+            if obj.currentTs:
+                return ISDateTime.from_timestamp(obj.currentTs).date()
+
+        return ISDateTime.now().date()
+
+    async def run(self) -> ReplayReport:
+
+        if not self.instrument_to_symbol:
+            log.warning("[ReplayEngine.run] no instruments.json, nothing will match")
+
+        volume_ticker = VolumeTicker(sink=self.sink, trade_rule=self.trade_rule)
+
+        processor = FeedProcessor(
+            volume_ticker=volume_ticker,
+            instrument_to_symbol=self.instrument_to_symbol,
+            today=self._session_date(),
+        )
+
+        report = ReplayReport()
+        latencies: List[int] = []
+
+        speed = self.speed
+        first_received_ns = 0
+        started_ns = time.perf_counter_ns()
+
+        for received_ns, frame in self.reader.frames():
+
+            if speed > 0:
+                if not first_received_ns:
+                    first_received_ns = received_ns
+
+                due_ns = started_ns + (received_ns - first_received_ns) / speed
+                wait_s = (due_ns - time.perf_counter_ns()) / 1e9
+                if wait_s > 0.001:
+                    await asyncio.sleep(wait_s)
+
+            t0 = time.perf_counter_ns()
+            report.ticks += processor.process_frame(frame)
+            latencies.append(time.perf_counter_ns() - t0)
+
+            report.frames += 1
+
+            # let the db writer drain between frames
+            await asyncio.sleep(0)
+
+        report.elapsed_s = (time.perf_counter_ns() - started_ns) / 1e9
+
+        await volume_ticker.dispose()
+
+        if report.elapsed_s > 0:
+            report.frames_per_s = report.frames / report.elapsed_s
+            report.ticks_per_s = report.ticks / report.elapsed_s
+
+        latencies.sort()
+        report.latency_us = {
+            name: percentile(latencies, q) / 1000
+            for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+        }
+        report.latency_us["max"] = (latencies[-1] if latencies else 0) / 1000
+
+        log.info(f"[ReplayEngine.run] {report}")
+
+        return report
+
+
+# ==========================================================
+# MAIN
+# ==========================================================
+
+
+async def main():
+
+    parser = argparse.ArgumentParser(description="Replay captured feed frames")
+    parser.add_argument("directory", help="capture directory of one session")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = max speed")
+    parser.add_argument(
+        "--sink", choices=["null", "memory", "file", "clickhouse"], default="memory"
+    )
+    parser.add_argument("--out", default="replay_volume.csv", help="file sink path")
+    parser.add_argument("--trade-rule", choices=["tick", "quote"], default="tick")
+    args = parser.parse_args()
+
+    if args.sink == "clickhouse":
+        await clickhouse_client.ensure_connection()
+        sink: RowSink = Tables.volume_history
+    elif args.sink == "file":
+        sink = FileSink(args.out)
+    elif args.sink == "null":
+        sink = NullSink()
+    else:
+        sink = MemorySink()
+
+    try:
+        report = await ReplayEngine(
+            args.directory, sink, speed=args.speed, trade_rule=args.trade_rule
+        ).run()
+        print(asdict(report))
+
+    finally:
+        if args.sink == "clickhouse":
+            await clickhouse_client.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        log.warning("Exiting...")
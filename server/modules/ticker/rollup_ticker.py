@@ -0,0 +1,256 @@
+from array import array
+from typing import List, Sequence
+
+from server.db.spool import InsertSpool
+from server.db.tables import Tables
+from server.modules.ticker.batch_writer import ColumnarBatchWriter
+from server.modules.ticker.models import RowSink
+from server.utils.is_dt import ISDateTime
+
+
+ROLLUP_COLUMNS = [
+    "symbol",
+    "interval",
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "buy",
+    "sell",
+    "delta",
+    "gap",
+]
+
+
+class CandleRollup:
+    """Multi-minute OHLCV and buy/sell buckets, folded from VolumeTicker's
+    closed minutes and written to volume_rollups as each bucket closes.
+
+    Buckets are aligned to the 09:15 IST open, so the hourly bar is
+    09:15-10:15 like the exchange's own candles. Minutes lost to a feed gap
+    are not folded; their bucket is written with ``gap`` = 1.
+    """
+
+    # 09:15 IST is 03:45 UTC, as minutes since the epoch day
+    ORIGIN_MINUTE = 3 * 60 + 45
+
+    def __init__(
+        self,
+        intervals: Sequence[int] = (5, 15, 60),
+        sink: RowSink = Tables.volume_rollups,
+        spool: InsertSpool | None = None,
+    ):
+
+        self.intervals = tuple(intervals)
+        self.size = 0
+
+        # one set of per-symbol columns per interval, indexed [interval][sid]
+        n = len(self.intervals)
+        self.bucket = [array("q") for _ in range(n)]
+        # 1 while the bucket holds minutes not yet emitted
+        self.open = [array("b") for _ in range(n)]
+        self.bar_open = [array("d") for _ in range(n)]
+        self.bar_high = [array("d") for _ in range(n)]
+        self.bar_low = [array("d") for _ in range(n)]
+        self.bar_close = [array("d") for _ in range(n)]
+        self.buy_vol = [array("q") for _ in range(n)]
+        self.sell_vol = [array("q") for _ in range(n)]
+        self.total_vol = [array("q") for _ in range(n)]
+        # start of the latest bucket holding a gap minute
+        self.gap = [array("q") for _ in range(n)]
+
+        self.writer = ColumnarBatchWriter(
+            name="CandleRollup",
+            sink=sink,
+            column_names=ROLLUP_COLUMNS,
+            spool=spool,
+        )
+
+    # ==========================================================
+    # SYMBOLS
+    # ==========================================================
+
+    def grow(self, count: int):
+
+        new = count - self.size
+        if new <= 0:
+            return
+
+        zeros_d = array("d", bytes(8 * new))
+        zeros_q = array("q", bytes(8 * new))
+        zeros_b = array("b", bytes(new))
+
+        for i in range(len(self.intervals)):
+            self.bucket[i].extend(zeros_q)
+            self.open[i].extend(zeros_b)
+            self.bar_open[i].extend(zeros_d)
+            self.bar_high[i].extend(zeros_d)
+            self.bar_low[i].extend(zeros_d)
+            self.bar_close[i].extend(zeros_d)
+            self.buy_vol[i].extend(zeros_q)
+            self.sell_vol[i].extend(zeros_q)
+            self.total_vol[i].extend(zeros_q)
+            self.gap[i].extend(zeros_q)
+
+        self.size = count
+
+    def state_columns(self) -> List[array]:
+        return [
+            column[i]
+            for i in range(len(self.intervals))
+            for column in (
+                self.bucket,
+                self.open,
+                self.bar_open,
+                self.bar_high,
+                self.bar_low,
+                self.bar_close,
+                self.buy_vol,
+                self.sell_vol,
+                self.total_vol,
+                self.gap,
+            )
+        ]
+
+    # ==========================================================
+    # EMIT
+    # ==========================================================
+
+    def emit_bucket(self, symbols: Sequence[str], i: int, sid: int):
+
+        buy = self.buy_vol[i][sid]
+        sell = self.sell_vol[i][sid]
+
+        self.writer.append(
+            (
+                symbols[sid],
+                self.intervals[i],
+                ISDateTime.from_timestamp(self.bucket[i][sid] * 60000),
+                self.bar_open[i][sid],
+                self.bar_high[i][sid],
+                self.bar_low[i][sid],
+                self.bar_close[i][sid],
+                self.total_vol[i][sid],
+                buy,
+                sell,
+                buy - sell,
+                1 if self.gap[i][sid] == self.bucket[i][sid] else 0,
+            )
+        )
+
+    # ==========================================================
+    # FOLD (one closed minute)
+    # ==========================================================
+
+    def fold(
+        self,
+        symbols: Sequence[str],
+        sid: int,
+        minute: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        buy: int,
+        sell: int,
+        total: int,
+    ) -> int:
+
+        emitted = 0
+
+        for i, interval in enumerate(self.intervals):
+
+            start = minute - (minute - self.ORIGIN_MINUTE) % interval
+            state_open = self.open[i]
+
+            if state_open[sid] and self.bucket[i][sid] != start:
+                # a symbol's minutes arrive in order: the old bucket is complete
+                self.emit_bucket(symbols, i, sid)
+                state_open[sid] = 0
+                emitted += 1
+
+            if not state_open[sid]:
+                state_open[sid] = 1
+                self.bucket[i][sid] = start
+                self.bar_open[i][sid] = open_
+                self.bar_high[i][sid] = high
+                self.bar_low[i][sid] = low
+                self.bar_close[i][sid] = close
+                self.buy_vol[i][sid] = buy
+                self.sell_vol[i][sid] = sell
+                self.total_vol[i][sid] = total
+                continue
+
+            if high > self.bar_high[i][sid]:
+                self.bar_high[i][sid] = high
+            if low < self.bar_low[i][sid]:
+                self.bar_low[i][sid] = low
+            self.bar_close[i][sid] = close
+            self.buy_vol[i][sid] += buy
+            self.sell_vol[i][sid] += sell
+            self.total_vol[i][sid] += total
+
+        return emitted
+
+    def mark_gap(self, symbols: Sequence[str], sid: int, minute: int) -> int:
+
+        # a gap minute in place of a fold: same bucket turnover, no data
+        emitted = 0
+
+        for i, interval in enumerate(self.intervals):
+
+            start = minute - (minute - self.ORIGIN_MINUTE) % interval
+            state_open = self.open[i]
+
+            if state_open[sid] and self.bucket[i][sid] != start:
+                self.emit_bucket(symbols, i, sid)
+                state_open[sid] = 0
+                emitted += 1
+
+            self.gap[i][sid] = start
+
+        return emitted
+
+    # ==========================================================
+    # BUCKET SWEEP
+    # ==========================================================
+
+    def close_buckets(self, symbols: Sequence[str], before_minute: int) -> int:
+
+        emitted = 0
+
+        for i, interval in enumerate(self.intervals):
+
+            state_open = self.open[i]
+            bucket = self.bucket[i]
+
+            for sid in range(self.size):
+
+                if state_open[sid] and bucket[sid] + interval <= before_minute:
+                    self.emit_bucket(symbols, i, sid)
+                    state_open[sid] = 0
+                    emitted += 1
+
+        if emitted:
+            self.writer.request_flush()
+
+        return emitted
+
+    def flush_open(self, symbols: Sequence[str]) -> int:
+
+        # shutdown: write partial buckets but keep them open, so a warm
+        # restart keeps folding into them and the final row replaces this one
+        emitted = 0
+
+        for i in range(len(self.intervals)):
+
+            state_open = self.open[i]
+
+            for sid in range(self.size):
+                if state_open[sid]:
+                    self.emit_bucket(symbols, i, sid)
+                    emitted += 1
+
+        return emitted
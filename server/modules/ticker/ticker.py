@@ -1,16 +1,33 @@
 import asyncio
 from asyncio import Task
-from datetime import time
 import json
+import os
+import time
 import uuid
-from typing import Dict
+from collections import deque
+from typing import Deque, Dict, List, Set, Tuple
 
 import websockets
+from websockets.asyncio.client import ClientConnection
 
+from config import Config
 from server.db.collections import Collections
-import server.modules.ticker.marketfeed_pb2 as pb
+from server.db.spool import insert_spool
+from server.modules.ticker.backfill import (
+    FileCandleSource,
+    GapBackfill,
+    UpstoxCandleSource,
+)
+from server.modules.ticker.batch_writer import ColumnarBatchWriter
+from server.modules.ticker.book_ticker import BookTicker
+from server.modules.ticker.decode_pool import DecodePool
+from server.modules.ticker.feed_processor import FeedProcessor
+from server.modules.ticker.footprint_ticker import FootprintTicker
+from server.modules.ticker.frame_journal import FrameJournalWriter
+from server.modules.ticker.index_ticker import IndexTicker
+from server.modules.ticker.ohlc_ticker import OhlcTicker
+from server.modules.ticker.rollup_ticker import CandleRollup
 from server.modules.telegram.telegram import Telegram
-# from server.modules.ticker.ohlc_ticker import OhlcModel, OhlcTicker
 from server.modules.ticker.volume_ticker_clickhouse import VolumeTicker
 from server.modules.token.enums import Developer
 from server.modules.token.repository import TokenRepository
@@ -20,94 +37,195 @@ from server.utils.logger import log
 
 class Ticker:
     volume_ticker: VolumeTicker
-    # ohlc_ticker: OhlcTicker
+    index_ticker: IndexTicker
+    book_ticker: BookTicker | None = None
+    ohlc_ticker: OhlcTicker
     ws_task: Task | None = None
+    # stop() scheduled by a supervisor; held so it is not garbage-collected
+    stop_task: Task | None = None
+    journal: FrameJournalWriter | None = None
+    processor: FeedProcessor
+    decode_pool: DecodePool | None = None
+    shard_keys: List[List[str]] = []
+    # live connections keyed (shard, link), for sub/unsub without
+    # reconnecting; link 1 is the optional hot standby
+    sockets: Dict[Tuple[int, int], ClientConnection] = {}
+    # link whose frames are applied, per shard
+    active: Dict[int, int] = {}
+    # recent frames received on a non-active link, replayed on promotion
+    standby_frames: Dict[Tuple[int, int], Deque[Tuple[int, bytes]]] = {}
+    sync_lock = asyncio.Lock()
+    backfill: GapBackfill | None = None
+    # wall-clock epoch ms of each shard's latest applied frame; where a gap starts
+    last_frame_ms: Dict[int, int] = {}
+    last_recv_ms: Dict[Tuple[int, int], int] = {}
+    connected_ms: Dict[Tuple[int, int], int] = {}
+    # links the watchdog closed; their reconnect is not a crash
+    stalled: Set[Tuple[int, int]] = set()
+    # epoch ms of the VolumeTicker snapshot restored at start
+    restored_ms: int | None = None
 
     retry_count = 3
     URL = "wss://api.upstox.com/v3/feed/market-data-feed"
 
-    # @staticmethod
-    # def extract_i1_ohlc_market(
-    #     market_ff: pb.MarketFullFeed, symbol: str
-    # ) -> OhlcModel | None:
-
-    #     ohlc_list = market_ff.marketOHLC.ohlc
-
-    #     for candle in ohlc_list:
-    #         if candle.interval == "I1":
-    #             return OhlcModel(
-    #                 symbol=symbol,
-    #                 timestamp=ISDateTime.from_timestamp(candle.ts),
-    #                 open=candle.open,
-    #                 high=candle.high,
-    #                 low=candle.low,
-    #                 close=candle.close,
-    #                 volume=candle.vol,
-    #                 # oi=oi,
-    #             )
-
-    #     return None
-
-    # @staticmethod
-    # def extract_i1_ohlc_index(
-    #     index_ff: pb.IndexFullFeed, symbol: str
-    # ) -> OhlcModel | None:
-
-    #     ohlc_list = index_ff.marketOHLC.ohlc
-
-    #     for candle in ohlc_list:
-    #         if candle.interval == "I1":
-    #             return OhlcModel(
-    #                 symbol=symbol,
-    #                 timestamp=ISDateTime.from_timestamp(candle.ts),
-    #                 open=candle.open,
-    #                 high=candle.high,
-    #                 low=candle.low,
-    #                 close=candle.close,
-    #                 volume=candle.vol,
-    #                 # oi=oi,
-    #             )
-
-    #     return None
-
     # -----------------------------------------
-    # WebSocket Listener
+    # Instruments
     # -----------------------------------------
     @classmethod
-    async def run_ws(cls):
-
-        AUTH_TOKEN = await TokenRepository.get_token(Developer.ANKIT)
-        headers = {"Authorization": f"Bearer {AUTH_TOKEN}"}
+    async def load_instruments(cls) -> Dict[str, str]:
 
         stocks = await Collections.stocks.find(
             {}, {"_id": 0, "instrument_key": 1, "symbol": 1}
         )
-        # indices = await Collections.indices.find(
-        #     {}, {"_id": 0, "instrument_key": 1, "symbol": 1}
-        # )
+        indices = await Collections.indices.find(
+            {}, {"_id": 0, "instrument_key": 1, "symbol": 1}
+        )
 
         instrument_to_symbol: Dict[str, str] = {
             doc["instrument_key"]: doc["symbol"] for doc in stocks
         }
 
-        # instrument_to_symbol.update(
-        #     {doc["instrument_key"]: doc["symbol"] for doc in indices}
-        # )
+        instrument_to_symbol.update(
+            {doc["instrument_key"]: doc["symbol"] for doc in indices}
+        )
 
         # instrument_to_symbol: Dict[str, str] = {
         #     "NSE_INDEX|Nifty 50": "Nifty50",
         #     "NSE_EQ|INE114A01011": "SAIL",
         # }
 
-        instrumentKeys = list(instrument_to_symbol.keys())
+        return instrument_to_symbol
+
+    @staticmethod
+    def subscription(method: str, instrumentKeys: List[str]) -> bytes:
+
+        payload = {
+            "guid": str(uuid.uuid4()),
+            "method": method,
+            "data": {
+                "mode": "full",
+                "instrumentKeys": instrumentKeys,
+            },
+        }
+
+        if method == "unsub":
+            del payload["data"]["mode"]
+
+        return json.dumps(payload).encode()
+
+    # -----------------------------------------
+    # Instrument Sync
+    # -----------------------------------------
+    @classmethod
+    async def sync_instruments(cls) -> Dict[str, int]:
+
+        async with cls.sync_lock:
+
+            latest = await cls.load_instruments()
+
+            processor = cls.processor
+            current = processor.instrument_to_symbol
+
+            added = {k: v for k, v in latest.items() if k not in current}
+            removed = [k for k in current if k not in latest]
+            renamed = {
+                k: v for k, v in latest.items() if k in current and current[k] != v
+            }
+
+            changes = {"added": len(added), "removed": len(removed), "renamed": len(renamed)}
+
+            if not added and not removed and not renamed:
+                return changes
+
+            if cls.journal:
+                # replay has to resolve every key it may find in the capture
+                cls.journal.write_instruments({**current, **latest})
+
+            processor.add_instruments({**added, **renamed})
+            processor.remove_instruments(removed)
+
+            key_to_shard = {
+                key: shard for shard, keys in enumerate(cls.shard_keys) for key in keys
+            }
+
+            unsub: Dict[int, List[str]] = {}
+            for key in removed:
+                shard = key_to_shard.get(key)
+                if shard is not None:
+                    cls.shard_keys[shard].remove(key)
+                    unsub.setdefault(shard, []).append(key)
+
+            sub: Dict[int, List[str]] = {}
+            for key in added:
+                shard = min(
+                    range(len(cls.shard_keys)), key=lambda i: len(cls.shard_keys[i])
+                )
+                cls.shard_keys[shard].append(key)
+                sub.setdefault(shard, []).append(key)
+
+            # a shard that is reconnecting picks the change up from shard_keys
+            for method, by_shard in (("unsub", unsub), ("sub", sub)):
+                for (shard, link), ws in list(cls.sockets.items()):
+                    keys = by_shard.get(shard)
+                    if not keys:
+                        continue
+                    try:
+                        await ws.send(cls.subscription(method, keys))
+                    except Exception as e:
+                        log.warning(
+                            f"[Ticker.sync_instruments] {method} on shard {shard + 1}/{link} failed: {e}"
+                        )
+
+            msg = f"[Ticker.sync_instruments] {changes}, {len(current)} instruments subscribed"
+            log.info(msg)
+            await Telegram.send_message(msg)
+
+            return changes
+
+    @classmethod
+    async def _instrument_watch(cls):
+
+        while True:
+            await asyncio.sleep(Config.TICKER_INSTRUMENT_SYNC_S)
+            try:
+                await cls.sync_instruments()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"[Ticker._instrument_watch] sync failed: {e}")
+
+    @classmethod
+    async def sync(cls):
+
+        if not cls.ws_task or cls.ws_task.done() or not cls.shard_keys:
+            await Telegram.send_message("Ticker not running.")
+            return
+
+        try:
+            changes = await cls.sync_instruments()
+        except Exception as e:
+            await Telegram.send_message(f"[Ticker] instrument sync failed: {e}")
+            return
+
+        if not any(changes.values()):
+            await Telegram.send_message("Ticker instruments already in sync.")
 
-        # https://www.nseindia.com/static/market-data/market-timings
-        # Block Deal session 1 Open 	        08:45 hrs -- Start
-        # Trade Modification cut-off time * 	16:15 hrs -- End
-        MARKET_START = time(9, 15)
-        MARKET_END = time(16, 00)
+    # -----------------------------------------
+    # WebSocket Listener
+    # -----------------------------------------
+    @classmethod
+    async def run_ws(cls, shard: int, instrumentKeys: List[str], link: int = 0):
+
+        AUTH_TOKEN = await TokenRepository.get_token(Developer.ANKIT)
+        headers = {"Authorization": f"Bearer {AUTH_TOKEN}"}
 
-        today = ISDateTime.now().date()
+        journal = cls.journal
+        processor = cls.processor
+        decode_pool = cls.decode_pool
+        last_frame_ms = cls.last_frame_ms
+        last_recv_ms = cls.last_recv_ms
+        active = cls.active
+        key = (shard, link)
 
         async with websockets.connect(
             cls.URL,
@@ -116,121 +234,358 @@ class Ticker:
             ping_timeout=10,
         ) as ws:
 
-            payload = {
-                "guid": str(uuid.uuid4()),
-                "method": "sub",
-                "data": {
-                    "mode": "full",
-                    "instrumentKeys": instrumentKeys,
-                },
-            }
+            # registered before the initial sub is built, so a sync from here
+            # on is either in instrumentKeys or sent on this socket
+            cls.sockets[key] = ws
+            cls.connected_ms[key] = time.time_ns() // 1_000_000
+            buffer = cls.standby_frames[key] = deque(maxlen=Config.TICKER_STANDBY_FRAMES)
+
+            await ws.send(cls.subscription("sub", instrumentKeys))
 
-            await ws.send(json.dumps(payload).encode())
+            if shard not in active:
+                cls.activate(shard, link)
 
+            role = "standby" if active.get(shard) != link else "primary"
             await Telegram.send_message(
-                f"Upstox WS connected. {len(instrumentKeys)} instruments subscribed. date: {today}, time: {ISDateTime.now().time()}"
+                f"Upstox WS shard {shard + 1}/{len(cls.shard_keys)} {role} connected. {len(instrumentKeys)} instruments subscribed. date: {processor.today}, time: {ISDateTime.now().time()}"
             )
 
-            obj = pb.FeedResponse()
-
-            INITIAL = pb.Type.initial_feed
-            LIVE = pb.Type.live_feed
-
             while True:
                 message = await ws.recv()
 
                 if not isinstance(message, bytes):
                     continue
 
-                obj.Clear()
+                now_ms = time.time_ns() // 1_000_000
+                last_recv_ms[key] = now_ms
 
-                try:
-                    obj.ParseFromString(message)
-                except Exception:
-                    log.warning("obj.ParseFromString failed")
+                if active.get(shard) != link:
+                    buffer.append((now_ms, message))
                     continue
 
-                if obj.type != INITIAL and obj.type != LIVE:
-                    continue
+                last_frame_ms[shard] = now_ms
 
-                feeds = obj.feeds
+                if journal:
+                    journal.append(message)
 
-                for instrument_key, feed in feeds.items():
+                if decode_pool:
+                    await decode_pool.submit(message)
+                else:
+                    processor.process_frame(message)
 
-                    symbol = instrument_to_symbol.get(instrument_key)
-                    if symbol is None:
-                        continue
+    # -----------------------------------------
+    # Failover
+    # -----------------------------------------
+    @classmethod
+    def activate(cls, shard: int, link: int):
 
-                    if feed.WhichOneof("FeedUnion") != "fullFeed":
-                        continue
+        # no awaits: buffered frames are applied before the next recv
+        cls.active[shard] = link
 
-                    full_feed = feed.fullFeed
+        now_ms = time.time_ns() // 1_000_000
+        gap_start = cls.last_frame_ms.get(shard)
+        gap_end = now_ms
 
-                    feed_type = full_feed.WhichOneof("FullFeedUnion")
+        buffer = cls.standby_frames.get((shard, link))
+        frames = list(buffer) if buffer else []
+        if buffer:
+            buffer.clear()
 
-                    if feed_type == "marketFF":
-                        marketFF = full_feed.marketFF
-                        ltpc = marketFF.ltpc
-                        ltt = ltpc.ltt
+            # the buffer reaches back past the last applied frame: no gap
+            if gap_start is not None and frames[0][0] <= gap_start:
+                gap_start = None
+            else:
+                gap_end = frames[0][0]
 
-                        if ltt == 0:
-                            continue
+        if gap_start:
+            # stocks only: indices have no volume to repair
+            mapping = cls.processor.instrument_to_symbol
+            stocks = cls.processor.instrument_to_id
+            keys = [key for key in cls.shard_keys[shard] if key in stocks]
 
-                        timestamp = ISDateTime.from_timestamp(ltt)
+            # before the replay, which may already emit the gap's first minute
+            cls.volume_ticker.mark_gap([stocks[key] for key in keys], gap_end)
 
-                        if timestamp.date() != today or not (
-                            MARKET_START <= timestamp.time() <= MARKET_END
-                        ):
-                            continue
+            if cls.backfill:
+                cls.backfill.add_gap({key: mapping[key] for key in keys}, gap_start, gap_end)
 
-                        ltp = ltpc.ltp
-                        vtt = marketFF.vtt
-                        # oi = int(marketFF.oi)
+        if frames:
+            # frames the old link also delivered are dropped by VolumeTicker's
+            # ltt/vtt check, so the whole buffer can be replayed
+            for _, message in frames:
+                if cls.journal:
+                    cls.journal.append(message)
+                cls.processor.process_frame(message)
 
-                        # volume ticker
-                        cls.volume_ticker.process_tick(
-                            symbol=symbol,
-                            ltp=ltp,
-                            ltt=timestamp,
-                            vtt=vtt,
-                        )
-                        
-                        # ohlc ticker
-                        # candle = cls.extract_i1_ohlc_market(marketFF, symbol=symbol)
-                        # if candle:
-                        #     cls.ohlc_ticker.process_ohlc(candle=candle)
-
-                    # elif feed_type == "indexFF":
-                    #     indexFF = full_feed.indexFF
-                    #     candle = cls.extract_i1_ohlc_index(indexFF, symbol=symbol)
-                    #     if candle:
-                    #         cls.ohlc_ticker.process_ohlc(candle=candle)
+            cls.last_frame_ms[shard] = frames[-1][0]
+
+    @classmethod
+    def _drop_link(cls, shard: int, link: int) -> bool:
+
+        cls.sockets.pop((shard, link), None)
+        cls.standby_frames.pop((shard, link), None)
+
+        if cls.active.get(shard) != link:
+            return False
+
+        del cls.active[shard]
+
+        # promote the standby if it is up; otherwise the next link to
+        # connect becomes active
+        if (shard, 1 - link) in cls.sockets:
+            cls.activate(shard, 1 - link)
+            return True
+
+        return False
+
+    @classmethod
+    async def _run_link(cls, shard: int, link: int):
+
+        try:
+            await cls.run_ws(shard, cls.shard_keys[shard], link)
+        except Exception:
+            if cls._drop_link(shard, link):
+                msg = f"[Ticker] shard {shard + 1} failed over to its standby connection"
+                log.warning(msg)
+                await Telegram.send_message(msg)
+            raise
+        finally:
+            cls.sockets.pop((shard, link), None)
+            cls.standby_frames.pop((shard, link), None)
+            if cls.active.get(shard) == link:
+                del cls.active[shard]
 
     @classmethod
-    async def _run_supervisor(cls):
+    async def _run_supervisor(cls, shard: int, link: int = 0):
 
         retry = 0
         base_backoff = 1
+        name = f"{shard + 1}" if link == 0 else f"{shard + 1} standby"
+        key = (shard, link)
 
-        while retry < cls.retry_count:
+        # the standby is optional: it retries on a capped backoff and never
+        # takes the ticker down with it
+        while link or retry < cls.retry_count:
+            started_ms = time.time_ns() // 1_000_000
             try:
-                await cls.run_ws()
+                await cls._run_link(shard, link)
                 retry = 0  # reset if success
             except Exception as e:
+                if key in cls.stalled:
+                    cls.stalled.discard(key)
+                    log.warning(f"WS shard {name} reconnecting after stall: {e}")
+                    continue
+
+                # a connection that delivered frames worked; only back-to-back
+                # failures count toward the budget
+                if cls.last_recv_ms.get(key, 0) >= started_ms:
+                    retry = 0
+
                 retry += 1
-                backoff = base_backoff * (2**retry)
+                backoff = base_backoff * (2 ** min(retry, cls.retry_count))
 
-                log.error(f"WS crashed: {e}")
+                log.error(f"WS shard {name} crashed: {e}")
 
+                budget = "standby" if link else f"{retry}/{cls.retry_count}"
                 await Telegram.send_message(
-                    f"[Ticker WS Crash]\n{e}\nRetry {retry}/{cls.retry_count} in {backoff} seconds..."
+                    f"[Ticker WS Crash] shard {name}/{len(cls.shard_keys)}\n{e}\nRetry {budget} in {backoff} seconds..."
+                )
+
+                await asyncio.sleep(backoff)
+
+        await Telegram.send_message(
+            f"Max WS retries reached on shard {name}. Stopping ticker... Please start manually after fixing the issue."
+        )
+
+        # stop() cancels and awaits ws_task, which this supervisor runs under
+        cls.stop_task = asyncio.create_task(cls.stop())
+
+    # -----------------------------------------
+    # Watchdog
+    # -----------------------------------------
+    @classmethod
+    async def _watchdog(cls):
+
+        stall_ms = int(Config.TICKER_STALL_S * 1000)
+        quiet_ms = int(Config.TICKER_QUIET_S * 1000)
+
+        quiet: Set[int] = set()
+        next_quiet_check = 0
+
+        while True:
+            await asyncio.sleep(Config.TICKER_STALL_S / 4)
+
+            try:
+                now_ms = time.time_ns() // 1_000_000
+                processor = cls.processor
+
+                # market hours as the feed processor sees them
+                if not processor.session_start_ms <= now_ms <= processor.session_end_ms:
+                    continue
+
+                for (shard, link), ws in list(cls.sockets.items()):
+                    last = max(
+                        cls.last_recv_ms.get((shard, link), 0),
+                        cls.connected_ms.get((shard, link), 0),
+                    )
+                    if now_ms - last <= stall_ms:
+                        continue
+
+                    msg = f"[Ticker._watchdog] shard {shard + 1}/{link} silent for {(now_ms - last) / 1000:.0f}s, reconnecting"
+                    log.warning(msg)
+                    await Telegram.send_message(msg)
+
+                    cls.stalled.add((shard, link))
+                    await ws.close()
+
+                if now_ms < next_quiet_check:
+                    continue
+                next_quiet_check = now_ms + 60000
+
+                volume_ticker = cls.volume_ticker
+                now_quiet = set(
+                    volume_ticker.quiet_symbols(
+                        processor.instrument_to_id.values(), now_ms - quiet_ms
+                    )
                 )
+                gone_quiet = now_quiet - quiet
+                recovered = quiet - now_quiet
+                quiet = now_quiet
+
+                if gone_quiet or recovered:
+                    names = ", ".join(volume_ticker.symbols[sid] for sid in list(gone_quiet)[:20])
+                    msg = (
+                        f"[Ticker._watchdog] {len(gone_quiet)} symbols quiet for {Config.TICKER_QUIET_S:.0f}s+ "
+                        f"({len(recovered)} recovered, {len(quiet)} quiet in total): {names}"
+                    )
+                    log.warning(msg)
+                    await Telegram.send_message(msg)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"[Ticker._watchdog] {e}")
+
+    # -----------------------------------------
+    # Minute sweeper
+    # -----------------------------------------
+    @classmethod
+    async def _minute_sweeper(cls):
+
+        # wall-clock minute close for every ticker: minutes older than the
+        # current one are emitted TICKER_MINUTE_GRACE_S after it turns
+        grace_ms = int(Config.TICKER_MINUTE_GRACE_S * 1000)
+
+        while True:
+
+            now_ms = int(time.time() * 1000)
+            due_ms = (now_ms // 60000 + 1) * 60000 + grace_ms
+            await asyncio.sleep((due_ms - now_ms) / 1000)
+
+            try:
+                before = (int(time.time() * 1000) - grace_ms) // 60000
+                closed = cls.processor.close_minutes(before)
+
+                if closed:
+                    log.info(f"[Ticker._minute_sweeper] closed {closed} minute rows")
+
+            except Exception as e:
+                log.error(f"[Ticker._minute_sweeper] {e}")
+
+    # -----------------------------------------
+    # Snapshots
+    # -----------------------------------------
+    @classmethod
+    async def _snapshot_loop(cls):
+
+        while True:
+            await asyncio.sleep(Config.TICKER_SNAPSHOT_S)
+            try:
+                await cls.volume_ticker.save_snapshot(
+                    Config.TICKER_SNAPSHOT_PATH, ISDateTime.now().date()
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"[Ticker._snapshot_loop] {e}")
+
+    @classmethod
+    async def _run_shards(cls):
+
+        retry = 0
+        base_backoff = 1
 
+        while True:
+            try:
+                instrument_to_symbol = await cls.load_instruments()
+                break
+            except Exception as e:
+                retry += 1
+                log.error(f"[Ticker._run_shards] loading instruments failed: {e}")
+
+                if retry >= cls.retry_count:
+                    await Telegram.send_message(
+                        f"[Ticker] loading instruments failed: {e}\nStopping ticker... Please start manually after fixing the issue."
+                    )
+                    # releases the tickers and writers created by start()
+                    cls.stop_task = asyncio.create_task(cls.stop())
+                    return
+
+                backoff = base_backoff * (2**retry)
+                await Telegram.send_message(
+                    f"[Ticker] loading instruments failed: {e}\nRetry {retry}/{cls.retry_count} in {backoff} seconds..."
+                )
                 await asyncio.sleep(backoff)
 
-        await Telegram.send_message("Max WS retries reached. Stopping ticker... Please start manually after fixing the issue.")
+        if cls.journal:
+            cls.journal.write_instruments(instrument_to_symbol)
+
+        cls.processor = FeedProcessor(
+            volume_ticker=cls.volume_ticker,
+            instrument_to_symbol=instrument_to_symbol,
+            today=ISDateTime.now().date(),
+            index_ticker=cls.index_ticker,
+            book_ticker=cls.book_ticker,
+        )
+
+        if Config.TICKER_DECODE_WORKERS > 0:
+            cls.decode_pool = DecodePool(
+                processor=cls.processor,
+                workers=Config.TICKER_DECODE_WORKERS,
+                mode=Config.TICKER_DECODE_MODE,
+            )
 
-        await cls.stop()
+        # round-robin so every shard gets a similar share of the universe
+        keys = list(instrument_to_symbol.keys())
+        shards = max(1, min(Config.TICKER_SHARDS, len(keys)))
+        cls.shard_keys = [keys[i::shards] for i in range(shards)]
+
+        if cls.restored_ms:
+            # restart after a crash: the downtime is a gap on every shard
+            cls.last_frame_ms = {shard: cls.restored_ms for shard in range(shards)}
+
+        # every shard feeds the same FeedProcessor / VolumeTicker; a reconnect
+        # only blanks out the instruments on that one connection
+        watchers = []
+        if Config.TICKER_MINUTE_GRACE_S >= 0:
+            watchers.append(cls._minute_sweeper())
+        if Config.TICKER_INSTRUMENT_SYNC_S > 0:
+            watchers.append(cls._instrument_watch())
+        if Config.TICKER_STALL_S > 0:
+            watchers.append(cls._watchdog())
+        if Config.TICKER_SNAPSHOT_PATH and Config.TICKER_SNAPSHOT_S > 0:
+            watchers.append(cls._snapshot_loop())
+
+        links = 2 if Config.TICKER_STANDBY else 1
+
+        await asyncio.gather(
+            *(
+                cls._run_supervisor(shard, link)
+                for shard in range(shards)
+                for link in range(links)
+            ),
+            *watchers,
+        )
 
     # -----------------------------------------
     # Start
@@ -242,28 +597,138 @@ class Ticker:
             await Telegram.send_message("Ticker already running.")
             return
 
-        cls.volume_ticker = VolumeTicker()
-        # cls.ohlc_ticker = OhlcTicker()
-        cls.ws_task = asyncio.create_task(cls._run_supervisor())
+        # one intraday_history writer for stock and index candles
+        cls.ohlc_ticker = OhlcTicker(spool=insert_spool)
+
+        cls.volume_ticker = VolumeTicker(
+            spool=insert_spool,
+            rollup=(
+                CandleRollup(intervals=Config.TICKER_ROLLUP_MINUTES, spool=insert_spool)
+                if Config.TICKER_ROLLUP_MINUTES
+                else None
+            ),
+            ohlc=cls.ohlc_ticker,
+            trade_rule=Config.TICKER_TRADE_RULE,
+            footprint=(
+                FootprintTicker(tick=Config.TICKER_FOOTPRINT_TICK, spool=insert_spool)
+                if Config.TICKER_FOOTPRINT_TICK
+                else None
+            ),
+        )
+
+        cls.index_ticker = IndexTicker(ohlc=cls.ohlc_ticker)
 
-        await Telegram.send_message("Ticker started")
+        # shares VolumeTicker's symbol ids (and the list, so a restore covers it)
+        cls.book_ticker = (
+            BookTicker(cls.volume_ticker.symbols, spool=insert_spool)
+            if Config.TICKER_BOOK
+            else None
+        )
+
+        cls.restored_ms = None
+        if Config.TICKER_SNAPSHOT_PATH:
+            try:
+                cls.restored_ms = cls.volume_ticker.load_snapshot(
+                    Config.TICKER_SNAPSHOT_PATH, ISDateTime.now().date()
+                )
+            except Exception as e:
+                log.error(f"[Ticker.start] snapshot restore failed: {e}")
+
+            if cls.restored_ms:
+                await Telegram.send_message(
+                    f"[Ticker] restored {len(cls.volume_ticker.symbols)} symbols from snapshot at {ISDateTime.from_timestamp(cls.restored_ms).time()}"
+                )
+
+        if Config.TICKER_CAPTURE_DIR:
+            cls.journal = FrameJournalWriter(
+                directory=os.path.join(
+                    Config.TICKER_CAPTURE_DIR, str(ISDateTime.now().date())
+                ),
+                segment_size=Config.TICKER_CAPTURE_SEGMENT_MB * 1024 * 1024,
+            )
+
+        if Config.TICKER_BACKFILL != "off":
+            cls.backfill = GapBackfill(
+                source=(
+                    UpstoxCandleSource()
+                    if Config.TICKER_BACKFILL == "upstox"
+                    else FileCandleSource(Config.TICKER_BACKFILL)
+                ),
+                spool=insert_spool,
+                settle=Config.TICKER_BACKFILL_SETTLE_S,
+                rate=Config.TICKER_BACKFILL_RPS,
+                retries=Config.TICKER_BACKFILL_RETRIES,
+            )
+        cls.active = {}
+        cls.last_frame_ms = {}
+        cls.last_recv_ms = {}
+        cls.connected_ms = {}
+        cls.stalled = set()
+
+        cls.ws_task = asyncio.create_task(cls._run_shards())
+
+        await Telegram.send_message(
+            f"Ticker started. Writers: {', '.join(w.name for w in cls._writers())}"
+        )
 
     # -----------------------------------------
     # Stop
     # -----------------------------------------
+    @classmethod
+    def _writers(cls) -> List[ColumnarBatchWriter]:
+
+        writers = [cls.volume_ticker.writer, cls.ohlc_ticker.writer]
+        if cls.volume_ticker.rollup:
+            writers.append(cls.volume_ticker.rollup.writer)
+        if cls.volume_ticker.footprint:
+            writers.append(cls.volume_ticker.footprint.vwap_writer)
+            writers.append(cls.volume_ticker.footprint.footprint_writer)
+        if cls.book_ticker:
+            writers.append(cls.book_ticker.writer)
+        if cls.backfill:
+            writers.append(cls.backfill.writer)
+            writers.append(cls.backfill.ohlc_writer)
+        return writers
+
     @classmethod
     async def stop(cls):
 
         if cls.ws_task:
+            # the book ticker and backfill are released below
+            writers = cls._writers()
             cls.ws_task.cancel()
             try:
                 await cls.ws_task
             except asyncio.CancelledError:
                 pass
+            if cls.decode_pool:
+                await cls.decode_pool.close()
+                cls.decode_pool = None
+            if Config.TICKER_SNAPSHOT_PATH:
+                try:
+                    # before dispose() writes the open minutes: a restart keeps
+                    # adding to them, and their final rows replace the partial ones
+                    await cls.volume_ticker.save_snapshot(
+                        Config.TICKER_SNAPSHOT_PATH, ISDateTime.now().date()
+                    )
+                except Exception as e:
+                    log.error(f"[Ticker.stop] snapshot failed: {e}")
             await cls.volume_ticker.dispose()
-            # await cls.ohlc_ticker.dispose()
+            await cls.index_ticker.dispose()
+            if cls.book_ticker:
+                await cls.book_ticker.dispose()
+                cls.book_ticker = None
+            await cls.ohlc_ticker.dispose()
+            if cls.backfill:
+                await cls.backfill.close()
+                cls.backfill = None
+            if cls.journal:
+                await asyncio.to_thread(cls.journal.close)
+                cls.journal = None
             cls.ws_task = None
-            await Telegram.send_message("Ticker stopped cleanly.")
+            await Telegram.send_message(
+                f"Ticker stopped cleanly. Rows written: {', '.join(w.summary() for w in writers)}"
+            )
         else:
             await Telegram.send_message("Ticker is already stopped.")
 
@@ -276,3 +741,10 @@ class Ticker:
             await Telegram.send_message("Ticker running.")
         else:
             await Telegram.send_message("Ticker not running.")
+
+        await Telegram.send_message(f"Insert spool: {insert_spool.metrics()}")
+
+        if cls.backfill:
+            await Telegram.send_message(
+                f"Gap backfill: repaired={cls.backfill.gaps_repaired} rows={cls.backfill.rows_repaired} fetch_failed={cls.backfill.fetch_failed}"
+            )
@@ -1,181 +1,511 @@
-from server.modules.telegram.telegram import Telegram
 from server.utils.logger import log
-from typing import Dict, List
+from typing import Dict, Iterable, List, Sequence
 import asyncio
-from datetime import datetime
-from asyncio import Queue
-
-from server.modules.ticker.models import Direction, VolumeDeltaModel, VolumeDetailModel
+import os
+import struct
+import time
+import zlib
+from array import array
+from datetime import date
+from itertools import repeat
+
+from server.modules.ticker.batch_writer import ColumnarBatchWriter
+from server.modules.ticker.footprint_ticker import FootprintTicker
+from server.modules.ticker.minute_ticker import MinuteTicker
+from server.modules.ticker.models import Direction, RowSink
+from server.modules.ticker.ohlc_ticker import OhlcTicker
+from server.modules.ticker.rollup_ticker import CandleRollup
+from server.db.spool import InsertSpool
 from server.db.tables import Tables
-
-
-class VolumeTicker:
-
-    def __init__(self):
-
-        self.symbols_state: Dict[str, VolumeDetailModel] = {}
-
-        self.write_queue: Queue[VolumeDeltaModel] = Queue(maxsize=100000)
-
-        self.rows: List[VolumeDeltaModel] = []
-
-        self.BATCH_SIZE = 100
-
-        self.FLUSH_TIMEOUT = 5
-
-        self.writer_task = asyncio.create_task(self.db_writer())
+from server.utils.is_dt import ISDateTime
+
+
+# magic, trading day (yyyymmdd), taken at (epoch ms), closed_minute,
+# symbol count, symbol blob length, footprint bins blob length
+SNAPSHOT_MAGIC = b"MBVTSNP5"
+SNAPSHOT_HEADER = struct.Struct("<8sIqqIII")
+SNAPSHOT_CRC = struct.Struct("<I")
+
+
+class VolumeTicker(MinuteTicker):
+
+    # MarketFullFeed fields read from each tick
+    FEED_FIELDS = frozenset({"ltpc", "vtt"})
+
+    def __init__(
+        self,
+        sink: RowSink = Tables.volume_history,
+        spool: InsertSpool | None = None,
+        rollup: CandleRollup | None = None,
+        ohlc: OhlcTicker | None = None,
+        trade_rule: str = "tick",
+        footprint: FootprintTicker | None = None,
+    ):
+
+        self.sink = sink
+        self.rollup = rollup
+        self.ohlc = ohlc
+        self.footprint = footprint
+
+        # "quote": trades at/above the standing ask are buys, at/below the
+        # bid sells, the tick rule decides the rest (Lee-Ready style)
+        self.QUOTE_RULE = trade_rule == "quote"
+        if self.QUOTE_RULE:
+            self.FEED_FIELDS = self.FEED_FIELDS | {"marketLevel"}
+        if footprint:
+            # session VWAP
+            self.FEED_FIELDS = self.FEED_FIELDS | {"atp"}
+
+        # interned symbols: id -> symbol, symbol -> id
+        self.symbols: List[str] = []
+        self.symbol_ids: Dict[str, int] = {}
+
+        # per-symbol state, one typed column per field, indexed by symbol id
+        # ltt == 0 means no tick seen yet for that symbol
+        self.ltp = array("d")
+        self.ltt = array("q")
+        self.minute = array("q")
+        # 1 while the symbol's minute bucket holds ticks not yet emitted
+        self.open = array("b")
+        self.vtt = array("q")
+        self.direction = array("b")
+        # top of book from the symbol's previous tick: the quote the trades
+        # since then executed against; 0.0 when unknown
+        self.bid = array("d")
+        self.ask = array("d")
+        self.minute_buy_vol = array("q")
+        self.minute_sell_vol = array("q")
+        self.minute_total_vol = array("q")
+        # the minute's price bar: the intraday_history candle, folded into
+        # the rollup buckets on emit
+        self.bar_open = array("d")
+        self.bar_high = array("d")
+        self.bar_low = array("d")
+        self.bar_close = array("d")
+        # last minute of a feed gap: minutes up to it hold the vtt jump (or
+        # miss the gap's trades) and are left out of the rollups
+        self.gap_minute = array("q")
+
+        self.writer = ColumnarBatchWriter(
+            name="VolumeTicker",
+            sink=sink,
+            column_names=["symbol", "timestamp", "buy", "sell", "total", "delta"],
+            spool=spool,
+        )
+
+        # minutes up to closed_minute are emitted (Ticker's sweeper, or the
+        # closing-end status); ticks that arrive later than that are folded
+        # into the next open minute
+        self.closed_minute = 0
 
         log.info("[VolumeTicker] initialized")
 
     # ==========================================================
-    # FLUSH
+    # SYMBOLS
     # ==========================================================
 
-    async def flush_batch(self):
+    def register(self, symbols: Iterable[str]) -> List[int]:
+
+        ids = []
+        new = 0
+
+        for symbol in symbols:
+            sid = self.symbol_ids.get(symbol)
+            if sid is None:
+                sid = len(self.symbols)
+                self.symbol_ids[symbol] = sid
+                self.symbols.append(symbol)
+                new += 1
+            ids.append(sid)
+
+        if new:
+            zeros_d = array("d", bytes(8 * new))
+            zeros_q = array("q", bytes(8 * new))
+            zeros_b = array("b", bytes(new))
+
+            self.ltp.extend(zeros_d)
+            self.ltt.extend(zeros_q)
+            self.minute.extend(zeros_q)
+            self.open.extend(zeros_b)
+            self.vtt.extend(zeros_q)
+            self.direction.extend(zeros_b)
+            self.bid.extend(zeros_d)
+            self.ask.extend(zeros_d)
+            self.minute_buy_vol.extend(zeros_q)
+            self.minute_sell_vol.extend(zeros_q)
+            self.minute_total_vol.extend(zeros_q)
+            self.bar_open.extend(zeros_d)
+            self.bar_high.extend(zeros_d)
+            self.bar_low.extend(zeros_d)
+            self.bar_close.extend(zeros_d)
+            self.gap_minute.extend(zeros_q)
+
+            if self.rollup:
+                self.rollup.grow(len(self.symbols))
+            if self.footprint:
+                self.footprint.grow(len(self.symbols))
+
+        return ids
 
-        if not self.rows:
-            return
+    # ==========================================================
+    # EMIT
+    # ==========================================================
 
-        try:
+    def emit_minute(self, sid: int):
 
-            rows = [
-                (
-                    doc.symbol,
-                    doc.timestamp,
-                    doc.buy,
-                    doc.sell,
-                    doc.total,
-                    doc.delta,
-                )
-                for doc in self.rows
-            ]
+        buy = self.minute_buy_vol[sid]
+        sell = self.minute_sell_vol[sid]
+        total = self.minute_total_vol[sid]
 
-            await Tables.volume_history.insert(
-                rows=rows,
-                column_names=[
-                    "symbol",
-                    "timestamp",
-                    "buy",
-                    "sell",
-                    "total",
-                    "delta",
-                ],
+        self.writer.append(
+            (
+                self.symbols[sid],
+                ISDateTime.from_timestamp(self.minute[sid] * 60000),
+                buy,
+                sell,
+                total,
+                buy - sell,
+            )
+        )
+
+        if self.ohlc:
+            self.ohlc.emit(
+                self.symbols[sid],
+                self.minute[sid],
+                self.bar_open[sid],
+                self.bar_high[sid],
+                self.bar_low[sid],
+                self.bar_close[sid],
+                total,
             )
 
-        except Exception as e:
-            log.error(f"[VolumeTicker.flush_batch] Batch insert failed: {e}")
+        if self.footprint:
+            self.footprint.emit_minute(self.symbols, sid, self.minute[sid])
+
+        if self.rollup and self.minute[sid] <= self.gap_minute[sid]:
+            # the live minute is wrong and GapBackfill rewrites it: the
+            # bucket is written as having a gap instead
+            self.rollup.mark_gap(self.symbols, sid, self.minute[sid])
+        elif self.rollup:
+            self.rollup.fold(
+                self.symbols,
+                sid,
+                self.minute[sid],
+                self.bar_open[sid],
+                self.bar_high[sid],
+                self.bar_low[sid],
+                self.bar_close[sid],
+                buy,
+                sell,
+                total,
+            )
 
-        self.rows = []
+        self.minute_buy_vol[sid] = 0
+        self.minute_sell_vol[sid] = 0
+        self.minute_total_vol[sid] = 0
 
     # ==========================================================
-    # DB WRITER
+    # PROCESS TICKS
     # ==========================================================
 
-    async def db_writer(self):
-        msg = "[VolumeTicker.db_writer] started"
-        log.info(msg)
-        await Telegram.send_message(msg)
-        try:
-            while True:
-                try:
-                    doc = await asyncio.wait_for(
-                        self.write_queue.get(), timeout=self.FLUSH_TIMEOUT
-                    )
+    def process_ticks(
+        self,
+        sids: Sequence[int],
+        ltps: Sequence[float],
+        ltts: Sequence[int],
+        vtts: Sequence[int],
+        bids: Sequence[float] | None = None,
+        asks: Sequence[float] | None = None,
+    ) -> int:
+
+        # one pass over a whole frame's columns, state columns bound locally
+        state_ltp = self.ltp
+        state_ltt = self.ltt
+        state_minute = self.minute
+        state_open = self.open
+        state_vtt = self.vtt
+        state_direction = self.direction
+        state_bid = self.bid
+        state_ask = self.ask
+        minute_buy_vol = self.minute_buy_vol
+        minute_sell_vol = self.minute_sell_vol
+        minute_total_vol = self.minute_total_vol
+        bar_open = self.bar_open
+        bar_high = self.bar_high
+        bar_low = self.bar_low
+        bar_close = self.bar_close
+        emit_minute = self.emit_minute
+        footprint = self.footprint
+        closed_minute = self.closed_minute
+
+        BUY = Direction.buy.value
+        SELL = Direction.sell.value
+
+        quote_rule = self.QUOTE_RULE and bids is not None and asks is not None
+        if not quote_rule:
+            bids = asks = repeat(0.0)  # type: ignore
+
+        emitted = 0
+
+        for sid, ltp, ltt, vtt, bid, ask in zip(sids, ltps, ltts, vtts, bids, asks):  # type: ignore
+
+            minute = ltt // 60000
+            if minute <= closed_minute:
+                minute = closed_minute + 1
+
+            prev_ltt = state_ltt[sid]
+
+            if prev_ltt == 0:
+                state_ltp[sid] = ltp
+                state_ltt[sid] = ltt
+                state_minute[sid] = minute
+                state_open[sid] = 1
+                state_vtt[sid] = vtt
+                state_bid[sid] = bid
+                state_ask[sid] = ask
+                bar_open[sid] = bar_high[sid] = bar_low[sid] = bar_close[sid] = ltp
+                continue
+
+            prev_ltp = state_ltp[sid]
+            prev_vtt = state_vtt[sid]
+
+            # repeated or older tick (e.g. the same frame from a standby
+            # connection); a vtt reset still comes with a newer ltt
+            if vtt <= prev_vtt and ltt <= prev_ltt:
+                # no trade, but the book may have moved: the next trade
+                # executes against this quote
+                if quote_rule and vtt == prev_vtt and ltt == prev_ltt:
+                    state_bid[sid] = bid
+                    state_ask[sid] = ask
+                continue
+
+            if minute != state_minute[sid] or not state_open[sid]:
+                if state_open[sid]:
+                    emit_minute(sid)
+                    emitted += 1
+                bar_open[sid] = bar_high[sid] = bar_low[sid] = bar_close[sid] = ltp
+            else:
+                if ltp > bar_high[sid]:
+                    bar_high[sid] = ltp
+                elif ltp < bar_low[sid]:
+                    bar_low[sid] = ltp
+                bar_close[sid] = ltp
+
+            vol_delta = vtt - prev_vtt
+
+            if vol_delta > 0:
+
+                if ltp > prev_ltp:
+                    direction = state_direction[sid] = BUY
+                elif ltp < prev_ltp:
+                    direction = state_direction[sid] = SELL
+                else:
+                    direction = state_direction[sid]
+
+                # the quote overrides the tick rule, which stays the
+                # fallback state for trades inside the spread
+                if quote_rule:
+                    prev_ask = state_ask[sid]
+                    prev_bid = state_bid[sid]
+                    if prev_ask and ltp >= prev_ask:
+                        direction = BUY
+                    elif prev_bid and ltp <= prev_bid:
+                        direction = SELL
+
+                if direction == BUY:
+                    minute_buy_vol[sid] += vol_delta
+                elif direction == SELL:
+                    minute_sell_vol[sid] += vol_delta
+
+                minute_total_vol[sid] += vol_delta
+
+                if footprint:
+                    footprint.add(sid, ltp, vol_delta, direction)
+
+            state_ltt[sid] = ltt
+            state_minute[sid] = minute
+            state_open[sid] = 1
+            state_vtt[sid] = vtt
+            state_ltp[sid] = ltp
+            state_bid[sid] = bid
+            state_ask[sid] = ask
+
+        return emitted
+
+    def process_tick(self, sid: int, ltp: float, ltt: int, vtt: int) -> int:
+        return self.process_ticks((sid,), (ltp,), (ltt,), (vtt,))
+
+    def mark_gap(self, sids: Iterable[int], end_ms: int):
+
+        end_minute = end_ms // 60000
+        gap_minute = self.gap_minute
+
+        for sid in sids:
+            if end_minute > gap_minute[sid]:
+                gap_minute[sid] = end_minute
+
+    def quiet_symbols(self, sids: Iterable[int], before_ms: int) -> List[int]:
+
+        # ltt doubles as the per-symbol last-seen time; never-ticked symbols
+        # (ltt == 0) are not quiet, just illiquid
+        ltt = self.ltt
+        return [sid for sid in sids if 0 < ltt[sid] < before_ms]
 
-                    self.rows.append(doc)
+    # ==========================================================
+    # SNAPSHOT
+    # ==========================================================
 
-                    if len(self.rows) >= self.BATCH_SIZE:
-                        await self.flush_batch()
+    def _state_columns(self) -> List[array]:
+        columns = [
+            self.ltp,
+            self.ltt,
+            self.minute,
+            self.open,
+            self.vtt,
+            self.direction,
+            self.bid,
+            self.ask,
+            self.minute_buy_vol,
+            self.minute_sell_vol,
+            self.minute_total_vol,
+            self.bar_open,
+            self.bar_high,
+            self.bar_low,
+            self.bar_close,
+        ]
+        if self.rollup:
+            columns += self.rollup.state_columns()
+        if self.footprint:
+            columns += self.footprint.state_columns()
+        return columns
+
+    def snapshot(self, day: date) -> bytes:
+
+        symbols = "\n".join(self.symbols).encode()
+        bins = self.footprint.open_bins() if self.footprint else b""
+
+        body = b"".join(
+            [
+                SNAPSHOT_HEADER.pack(
+                    SNAPSHOT_MAGIC,
+                    day.year * 10000 + day.month * 100 + day.day,
+                    int(time.time() * 1000),
+                    self.closed_minute,
+                    len(self.symbols),
+                    len(symbols),
+                    len(bins),
+                ),
+                symbols,
+                *(column.tobytes() for column in self._state_columns()),
+                bins,
+            ]
+        )
 
-                except asyncio.TimeoutError:
-                    # timeout → flush partial batch
-                    await self.flush_batch()
+        return body + SNAPSHOT_CRC.pack(zlib.crc32(body))
 
-        except asyncio.CancelledError:
+    def restore(self, data: bytes, day: date) -> int | None:
 
-            while not self.write_queue.empty():
-                doc = await self.write_queue.get()
-                self.rows.append(doc)
+        # only into a fresh ticker, before FeedProcessor registers symbols
+        if self.symbols or len(data) < SNAPSHOT_HEADER.size + SNAPSHOT_CRC.size:
+            return None
 
-            await self.flush_batch()
-            msg = "[VolumeTicker.db_writer] stopped and flushed all docs"
-            log.info(msg)
-            await Telegram.send_message(msg)
+        body = data[: -SNAPSHOT_CRC.size]
+        (crc,) = SNAPSHOT_CRC.unpack(data[-SNAPSHOT_CRC.size :])
+        if zlib.crc32(body) != crc:
+            log.warning("[VolumeTicker.restore] snapshot checksum mismatch")
+            return None
 
-    # ==========================================================
-    # DIRECTION
-    # ==========================================================
+        magic, yyyymmdd, taken_ms, closed_minute, count, symbols_len, bins_len = (
+            SNAPSHOT_HEADER.unpack_from(body)
+        )
+        if magic != SNAPSHOT_MAGIC:
+            return None
+        if yyyymmdd != day.year * 10000 + day.month * 100 + day.day:
+            # another trading day's vtt baselines are meaningless today
+            return None
 
-    def get_direction(self, state: VolumeDetailModel, ltp: float) -> Direction:
+        columns = self._state_columns()
+        offset = SNAPSHOT_HEADER.size
 
-        if ltp > state.ltp:
-            state.direction = Direction.buy
+        # taken with another rollup or footprint configuration
+        expected = (
+            offset + symbols_len + count * sum(c.itemsize for c in columns) + bins_len
+        )
+        if len(body) != expected or (bins_len and not self.footprint):
+            log.warning("[VolumeTicker.restore] snapshot layout mismatch")
+            return None
 
-        elif ltp < state.ltp:
-            state.direction = Direction.sell
+        symbols = body[offset : offset + symbols_len].decode().split("\n") if count else []
+        offset += symbols_len
 
-        return state.direction
+        for column in columns:
+            size = count * column.itemsize
+            column.frombytes(body[offset : offset + size])
+            offset += size
 
-    # ==========================================================
-    # PROCESS TICK
-    # ==========================================================
+        self.symbols.extend(symbols)
+        self.symbol_ids.update((symbol, sid) for sid, symbol in enumerate(symbols))
+        self.closed_minute = closed_minute
+        # not snapshotted: the restart is a gap of its own
+        self.gap_minute.extend(array("q", bytes(8 * count)))
+        if self.rollup:
+            self.rollup.size = count
+        if self.footprint:
+            self.footprint.restore_bins(body[offset : offset + bins_len], count)
 
-    def process_tick(self, symbol: str, ltp: float, ltt: datetime, vtt: int):
+        return taken_ms
 
-        state = self.symbols_state.get(symbol)
+    async def save_snapshot(self, path: str, day: date):
 
-        if state is None:
-            state = VolumeDetailModel(symbol=symbol, ltt=ltt, vtt=vtt, ltp=ltp)
-            self.symbols_state[symbol] = state
-            return
+        # taken on the loop so the columns are consistent; written off it
+        data = self.snapshot(day)
+        await asyncio.to_thread(self._write_snapshot, path, data)
 
-        if state.ltp == ltp and state.ltt == ltt and state.vtt == vtt:
-            return
+    @staticmethod
+    def _write_snapshot(path: str, data: bytes):
 
-        vol_delta = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
 
-        vol_delta = vtt - state.vtt
-        if vol_delta < 0:
-            vol_delta = 0
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
 
-        if ltt.minute != state.ltt.minute:
+        # readers see the old snapshot or the new one, never a torn file
+        os.replace(tmp, path)
 
-            ts_minute = state.ltt.replace(second=0, microsecond=0)
+    def load_snapshot(self, path: str, day: date) -> int | None:
 
-            try:
+        if not os.path.exists(path):
+            return None
 
-                self.write_queue.put_nowait(
-                    VolumeDeltaModel(
-                        timestamp=ts_minute,
-                        symbol=symbol,
-                        buy=state.minute_buy_vol,
-                        sell=state.minute_sell_vol,
-                        total=state.minute_total_vol,
-                        delta=state.minute_buy_vol - state.minute_sell_vol,
-                    )
-                )
+        with open(path, "rb") as f:
+            data = f.read()
 
-            except asyncio.QueueFull:
-                log.error("[VolumeTicker.process_tick] queue full, dropping tick")
+        return self.restore(data, day)
 
-            state.minute_buy_vol = 0
-            state.minute_sell_vol = 0
-            state.minute_total_vol = 0
+    # ==========================================================
+    # MINUTE SWEEP
+    # ==========================================================
 
-        if vol_delta > 0:
-            direction = self.get_direction(state, ltp)
+    def close_minutes(self, before_minute: int) -> int:
 
-            if direction == Direction.buy:
-                state.minute_buy_vol += vol_delta
+        emitted = self.close_open_minutes(len(self.symbols), before_minute)
 
-            elif direction == Direction.sell:
-                state.minute_sell_vol += vol_delta
+        if emitted:
+            self.writer.request_flush()
+            if self.ohlc:
+                self.ohlc.request_flush()
+            if self.footprint:
+                self.footprint.request_flush()
 
-            state.minute_total_vol += vol_delta
+        if self.rollup:
+            self.rollup.close_buckets(self.symbols, before_minute)
 
-        state.ltt = ltt
-        state.vtt = vtt
-        state.ltp = ltp
+        return emitted
 
     # ==========================================================
     # DISPOSE
@@ -185,33 +515,23 @@ class VolumeTicker:
 
         log.info("[VolumeTicker.dispose] started")
 
-        for symbol, state in self.symbols_state.items():
+        state_open = self.open
+
+        for sid in range(len(self.symbols)):
 
-            ts_minute = state.ltt.replace(second=0, microsecond=0)
+            if not state_open[sid]:
+                continue
 
-            try:
+            self.emit_minute(sid)
+            state_open[sid] = 0
 
-                self.write_queue.put_nowait(
-                    VolumeDeltaModel(
-                        timestamp=ts_minute,
-                        symbol=symbol,
-                        buy=state.minute_buy_vol,
-                        sell=state.minute_sell_vol,
-                        total=state.minute_total_vol,
-                        delta=state.minute_buy_vol - state.minute_sell_vol,
-                    )
-                )
+        await self.writer.close()
 
-            except asyncio.QueueFull:
-                log.error("[VolumeTicker.dispose] queue full")
+        if self.footprint:
+            await self.footprint.close()
 
-        self.writer_task.cancel()
+        if self.rollup:
+            self.rollup.flush_open(self.symbols)
+            await self.rollup.writer.close()
 
-        try:
-            await self.writer_task
-        except asyncio.CancelledError:
-            pass
-        
-        msg = "[VolumeTicker.dispose] stopped"
-        log.info(msg)
-        await Telegram.send_message(msg)
+        log.info("[VolumeTicker.dispose] stopped")
@@ -1,4 +1,5 @@
 from typing import List
+from urllib.parse import quote
 
 from server.api import api_client
 from server.api.exceptions import BadRequestException, NotFoundException
@@ -10,6 +11,7 @@ from server.modules.token.repository import TokenRepository
 class UpstoxServices:
 
     option_chain_url = "https://api.upstox.com/v2/option/chain"
+    intraday_candle_url = "https://api.upstox.com/v3/historical-candle/intraday"
 
     @classmethod
     async def option_chain(
@@ -68,3 +70,23 @@ class UpstoxServices:
         except Exception as e:
             msg = f"[option_contract] Error fetching option contracts: {e} for {instrument_key}"
             raise NotFoundException(msg)
+
+    @classmethod
+    async def intraday_candles(
+        cls, instrument_key: str, developer: Developer, minutes: int = 1
+    ) -> List[list]:
+        # today's candles, newest first:
+        # [timestamp, open, high, low, close, volume, oi]
+        url = f"{cls.intraday_candle_url}/{quote(instrument_key, safe='')}/minutes/{minutes}"
+        headers = {
+            "Authorization": f"Bearer {await TokenRepository.get_token(developer)}"
+        }
+
+        try:
+            response = await api_client.get_json(url, headers=headers)
+            return response["data"]["candles"]
+
+        except Exception as e:
+            raise BadRequestException(
+                f"[UpstoxServices.intraday_candles] {e} for {instrument_key}"
+            )
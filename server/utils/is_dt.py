@@ -1,4 +1,4 @@
-from datetime import timedelta, timezone, datetime
+from datetime import date, time, timedelta, timezone, datetime
 
 
 class ISDateTime:
@@ -47,6 +47,12 @@ class ISDateTime:
         dt = datetime.fromtimestamp(timestamp * 0.001, tz=timezone.utc)
         return dt.astimezone(ISDateTime.__IST_TIMEZONE)
 
+    @staticmethod
+    # IST wall-clock date + time -> epoch milliseconds
+    def to_timestamp(d: date, t: time) -> int:
+        dt = datetime.combine(d, t, tzinfo=ISDateTime.__IST_TIMEZONE)
+        return int(dt.timestamp()) * 1000 + dt.microsecond // 1000
+
     @staticmethod
     def utc_to_ist_naive(utc_dt: datetime) -> datetime:
         ist_dt = utc_dt.astimezone(ISDateTime.__IST_TIMEZONE)
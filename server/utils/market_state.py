@@ -0,0 +1,98 @@
+import asyncio
+from datetime import time
+from enum import IntEnum
+from typing import Dict, List, Mapping, Tuple
+
+from server.utils.is_dt import ISDateTime
+from server.utils.logger import log
+
+
+NSE_EQ = "NSE_EQ"
+
+
+class MarketStatus(IntEnum):
+    # values of marketfeed.proto MarketStatus
+    PRE_OPEN_START = 0
+    PRE_OPEN_END = 1
+    NORMAL_OPEN = 2
+    NORMAL_CLOSE = 3
+    CLOSING_START = 4
+    CLOSING_END = 5
+
+
+# statuses in which trades print: continuous session through the closing session
+TRADING = frozenset(
+    {MarketStatus.NORMAL_OPEN, MarketStatus.NORMAL_CLOSE, MarketStatus.CLOSING_START}
+)
+
+
+class MarketState:
+    """Live per-segment status, fed from the feed's market_info frames.
+
+    ``closed(segment)`` is set only on an observed NORMAL_OPEN → close
+    transition, so a feed that connects after hours (or never) leaves the
+    callers on their clock fallback.
+    """
+
+    status: Dict[str, MarketStatus] = {}
+    changed_at: Dict[str, int] = {}
+    _closed: Dict[str, asyncio.Event] = {}
+
+    @classmethod
+    def update(
+        cls, segment_status: Mapping[str, int], ts_ms: int
+    ) -> List[Tuple[str, MarketStatus | None, MarketStatus]]:
+
+        transitions = []
+
+        for segment, value in segment_status.items():
+
+            try:
+                new = MarketStatus(value)
+            except ValueError:
+                log.warning(f"[MarketState.update] unknown status {value} for {segment}")
+                continue
+
+            old = cls.status.get(segment)
+            if old == new:
+                continue
+
+            cls.status[segment] = new
+            cls.changed_at[segment] = ts_ms
+            transitions.append((segment, old, new))
+
+            if new <= MarketStatus.NORMAL_OPEN:
+                cls.closed(segment).clear()
+            elif old == MarketStatus.NORMAL_OPEN:
+                cls.closed(segment).set()
+
+            log.info(f"[MarketState.update] {segment}: {old and old.name} → {new.name}")
+
+        return transitions
+
+    @classmethod
+    def get(cls, segment: str) -> MarketStatus | None:
+        return cls.status.get(segment)
+
+    @classmethod
+    def today(cls, segment: str) -> MarketStatus | None:
+
+        # a status stamped on an earlier day says nothing about today
+        today_ms = ISDateTime.to_timestamp(ISDateTime.now().date(), time(0, 0))
+        if cls.changed_at.get(segment, 0) < today_ms:
+            return None
+        return cls.status.get(segment)
+
+    @classmethod
+    def closed(cls, segment: str) -> asyncio.Event:
+
+        event = cls._closed.get(segment)
+        if event is None:
+            event = cls._closed[segment] = asyncio.Event()
+
+        # a close seen on an earlier day does not count
+        today_ms = ISDateTime.to_timestamp(ISDateTime.now().date(), time(0, 0))
+        if event.is_set() and cls.changed_at.get(segment, 0) < today_ms:
+            event.clear()
+
+        return event
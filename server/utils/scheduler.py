@@ -6,6 +6,7 @@ from server.api.exceptions import AppException
 from server.modules.telegram.telegram import Telegram
 from server.utils.is_dt import ISDateTime
 from server.utils.logger import log
+from server.utils.market_state import NSE_EQ, MarketState, MarketStatus
 
 
 class Scheduler:
@@ -20,9 +21,17 @@ class Scheduler:
 
         while True:
             now = ISDateTime.now()
+            closed = MarketState.closed(NSE_EQ)
+            status = MarketState.today(NSE_EQ)
 
-            # stop if market is closed
-            if now.time() >= datetime.time(15, 31):
+            # stop if market is closed: the feed's status when it reported
+            # one today (special sessions run past 15:31), the clock otherwise
+            if status is not None:
+                market_closed = closed.is_set() or status > MarketStatus.NORMAL_OPEN
+            else:
+                market_closed = now.time() >= datetime.time(15, 31)
+
+            if market_closed:
                 await Telegram.send_message(
                     f"[Scheduler] Exiting the scheduler for task {task.__name__} because market is closed."
                 )
@@ -47,7 +56,12 @@ class Scheduler:
                 f"[Scheduler.{task.__name__}]: Next run at {next_run.strftime('%Y-%m-%d %H:%M:%S')} (in {sleep_duration} seconds)\n"
             )
 
-            await asyncio.sleep(sleep_duration)
+            try:
+                # an early close wakes the scheduler instead of one more run
+                await asyncio.wait_for(closed.wait(), timeout=sleep_duration)
+                continue
+            except asyncio.TimeoutError:
+                pass
 
             try:
                 log.info(f"[Scheduler.{task.__name__}] Starting task...")
@@ -0,0 +1,352 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date, time as dt_time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server.modules.ticker.marketfeed_lite_pb2 as pb_lite
+import server.modules.ticker.marketfeed_pb2 as pb
+from server.modules.ticker.book_ticker import BookTicker
+from server.modules.ticker.feed_processor import FeedProcessor
+from server.modules.ticker.footprint_ticker import FootprintTicker
+from server.modules.ticker.index_ticker import IndexTicker
+from server.modules.ticker.ohlc_ticker import OhlcTicker
+from server.modules.ticker.replay import NullSink, percentile
+from server.modules.ticker.rollup_ticker import CandleRollup
+from server.modules.ticker.volume_ticker_clickhouse import VolumeTicker
+from server.utils.is_dt import ISDateTime
+from server.utils.logger import log
+
+
+# ==========================================================
+# SYNTHETIC FEED
+# ==========================================================
+
+
+class FeedGenerator:
+    """Builds realistic full-mode FeedResponse frames.
+
+    Every frame carries a random ``active_ratio`` share of the universe;
+    ltp does a tick-size random walk, vtt grows (and occasionally resets),
+    and a small share of ticks is stamped outside the session window.
+    """
+
+    def __init__(
+        self,
+        instruments: int = 2000,
+        indices: int = 10,
+        frames: int = 5000,
+        frame_interval_ms: int = 250,
+        active_ratio: float = 0.25,
+        vtt_reset_ratio: float = 0.0005,
+        out_of_window_ratio: float = 0.01,
+        depth: int = 5,
+        session: date = date(2026, 3, 2),
+        seed: int = 7,
+    ):
+
+        self.instruments = instruments
+        self.frames = frames
+        self.frame_interval_ms = frame_interval_ms
+        self.active_ratio = active_ratio
+        self.vtt_reset_ratio = vtt_reset_ratio
+        self.out_of_window_ratio = out_of_window_ratio
+        self.depth = depth
+        self.session = session
+        self.random = random.Random(seed)
+
+        self.instrument_to_symbol: Dict[str, str] = {
+            f"NSE_EQ|INE{i:06d}01": f"SYM{i}" for i in range(instruments)
+        }
+        self.index_keys = [f"NSE_INDEX|Index {i}" for i in range(indices)]
+        self.instrument_to_symbol.update({key: key.split("|")[1] for key in self.index_keys})
+
+    def build(self) -> List[bytes]:
+
+        rnd = self.random
+        keys = [key for key in self.instrument_to_symbol if key not in self.index_keys]
+        active = max(1, int(len(keys) * self.active_ratio))
+
+        ltp = {key: round(rnd.uniform(50, 5000), 1) for key in keys + self.index_keys}
+        vtt = {key: 0 for key in keys}
+
+        start_ms = ISDateTime.to_timestamp(self.session, dt_time(9, 15))
+        frames: List[bytes] = []
+
+        for i in range(self.frames):
+
+            now_ms = start_ms + i * self.frame_interval_ms
+
+            response = pb.FeedResponse(type=pb.Type.live_feed, currentTs=now_ms)
+
+            for key in rnd.sample(keys, active):
+
+                ltp[key] = round(max(1.0, ltp[key] + rnd.choice((-0.1, 0, 0.1))), 2)
+
+                if rnd.random() < self.vtt_reset_ratio:
+                    vtt[key] = 0
+                vtt[key] += rnd.randint(1, 2000)
+
+                ltt = now_ms - rnd.randint(0, self.frame_interval_ms)
+                if rnd.random() < self.out_of_window_ratio:
+                    ltt -= 86_400_000
+
+                market_ff = response.feeds[key].fullFeed.marketFF
+                market_ff.ltpc.ltp = ltp[key]
+                market_ff.ltpc.ltt = ltt
+                market_ff.ltpc.ltq = rnd.randint(1, 500)
+                market_ff.ltpc.cp = ltp[key]
+                market_ff.vtt = vtt[key]
+                market_ff.atp = ltp[key]
+                market_ff.tbq = rnd.randint(1000, 100000)
+                market_ff.tsq = rnd.randint(1000, 100000)
+
+                for level in range(self.depth):
+                    quote = market_ff.marketLevel.bidAskQuote.add()
+                    quote.bidP = ltp[key] - 0.05 * (level + 1)
+                    quote.askP = ltp[key] + 0.05 * (level + 1)
+                    quote.bidQ = rnd.randint(1, 5000)
+                    quote.askQ = rnd.randint(1, 5000)
+
+                for interval in ("I1", "I30"):
+                    candle = market_ff.marketOHLC.ohlc.add()
+                    candle.interval = interval
+                    candle.open = candle.high = candle.low = candle.close = ltp[key]
+                    candle.vol = vtt[key]
+                    candle.ts = now_ms // 60000 * 60000
+
+            # indices tick on every frame, ltpc and candles only
+            for key in self.index_keys:
+
+                ltp[key] = round(ltp[key] + rnd.choice((-0.05, 0, 0.05)), 2)
+
+                index_ff = response.feeds[key].fullFeed.indexFF
+                index_ff.ltpc.ltp = ltp[key]
+                index_ff.ltpc.ltt = now_ms
+                index_ff.ltpc.cp = ltp[key]
+
+                for interval in ("I1", "I30"):
+                    candle = index_ff.marketOHLC.ohlc.add()
+                    candle.interval = interval
+                    candle.open = candle.high = candle.low = candle.close = ltp[key]
+                    candle.ts = now_ms // 60000 * 60000
+
+            frames.append(response.SerializeToString())
+
+        return frames
+
+
+# ==========================================================
+# BENCHMARK
+# ==========================================================
+
+
+def _summary(latencies_ns: List[int]) -> Dict[str, float]:
+
+    latencies_ns = sorted(latencies_ns)
+    return {
+        "p50_us": percentile(latencies_ns, 0.5) / 1000,
+        "p99_us": percentile(latencies_ns, 0.99) / 1000,
+        "p999_us": percentile(latencies_ns, 0.999) / 1000,
+        "max_us": (latencies_ns[-1] if latencies_ns else 0) / 1000,
+    }
+
+
+def bench_decode(frames: List[bytes], lite: bool = False) -> Dict[str, float]:
+
+    # parse plus the field reads VolumeTicker needs, so the lazily built
+    # sub-messages are paid for in both schemas
+    obj = pb_lite.FeedResponse() if lite else pb.FeedResponse()
+    latencies: List[int] = []
+
+    for frame in frames:
+        t0 = time.perf_counter_ns()
+        obj.Clear()
+        obj.ParseFromString(frame)
+        for feed in obj.feeds.values():
+            market_ff = feed.fullFeed.marketFF
+            market_ff.ltpc.ltp, market_ff.ltpc.ltt, market_ff.vtt
+        latencies.append(time.perf_counter_ns() - t0)
+
+    total_s = sum(latencies) / 1e9
+    return {"frames_per_s": len(frames) / total_s, **_summary(latencies)}
+
+
+async def bench_process(
+    generator: FeedGenerator,
+    frames: List[bytes],
+    lite: bool = True,
+    trade_rule: str = "tick",
+    book: bool = False,
+    footprint: bool = False,
+) -> Dict[str, float]:
+
+    ohlc_ticker = OhlcTicker(sink=NullSink())
+    volume_ticker = VolumeTicker(
+        sink=NullSink(),
+        rollup=CandleRollup(sink=NullSink()),
+        ohlc=ohlc_ticker,
+        trade_rule=trade_rule,
+        footprint=(
+            FootprintTicker(vwap_sink=NullSink(), footprint_sink=NullSink())
+            if footprint
+            else None
+        ),
+    )
+    index_ticker = IndexTicker(ohlc=ohlc_ticker) if generator.index_keys else None
+    book_ticker = BookTicker(volume_ticker.symbols, sink=NullSink()) if book else None
+    processor = FeedProcessor(
+        volume_ticker=volume_ticker,
+        instrument_to_symbol=generator.instrument_to_symbol,
+        today=generator.session,
+        index_ticker=index_ticker,
+        book_ticker=book_ticker,
+    )
+    processor.lite = lite
+
+    latencies: List[int] = []
+    ticks = 0
+
+    for frame in frames:
+        t0 = time.perf_counter_ns()
+        ticks += processor.process_frame(frame)
+        latencies.append(time.perf_counter_ns() - t0)
+
+    await volume_ticker.dispose()
+    if index_ticker:
+        await index_ticker.dispose()
+    if book_ticker:
+        await book_ticker.dispose()
+    await ohlc_ticker.dispose()
+
+    total_s = sum(latencies) / 1e9
+    return {
+        "frames_per_s": len(frames) / total_s,
+        "ticks_per_s": ticks / total_s,
+        "ticks": ticks,
+        **_summary(latencies),
+    }
+
+
+async def run(args) -> Dict:
+
+    generator = FeedGenerator(
+        instruments=args.instruments,
+        indices=args.indices,
+        frames=args.frames,
+        frame_interval_ms=args.frame_interval_ms,
+        active_ratio=args.active_ratio,
+    )
+
+    t0 = time.perf_counter()
+    frames = generator.build()
+    log.info(
+        f"[feed_benchmark] built {len(frames)} frames in {time.perf_counter() - t0:.1f}s, "
+        f"avg {sum(map(len, frames)) / len(frames) / 1024:.1f} KiB/frame"
+    )
+
+    # untimed pass so the first measured section does not pay for warm-up
+    await bench_process(generator, frames)
+
+    decode = bench_decode(frames)
+    decode_lite = bench_decode(frames, lite=True)
+    process = await bench_process(generator, frames, lite=True)
+    process_full = await bench_process(generator, frames, lite=False)
+    process_quote = await bench_process(generator, frames, trade_rule="quote")
+    process_book = await bench_process(generator, frames, book=True)
+    process_footprint = await bench_process(generator, frames, footprint=True)
+
+    decode_total_s = len(frames) / decode_lite["frames_per_s"]
+    process_total_s = len(frames) / process["frames_per_s"]
+
+    return {
+        "params": {
+            "instruments": args.instruments,
+            "indices": args.indices,
+            "frames": args.frames,
+            "frame_interval_ms": args.frame_interval_ms,
+            "active_ratio": args.active_ratio,
+        },
+        "env": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "decode": decode,
+        "decode_lite": decode_lite,
+        "process_frame": process,
+        "process_frame_full": process_full,
+        "process_frame_quote": process_quote,
+        "process_frame_book": process_book,
+        "process_frame_footprint": process_footprint,
+        "lite_decode_saving_pct": (1 - decode["frames_per_s"] / decode_lite["frames_per_s"])
+        * 100,
+        # process_frame time not spent in decoding, per handled tick
+        "per_instrument_ns": max(0.0, process_total_s - decode_total_s)
+        * 1e9
+        / max(1, process["ticks"]),
+        # feed arrival rate the pipeline must sustain
+        "required_frames_per_s": 1000 / args.frame_interval_ms,
+    }
+
+
+def compare(result: Dict, baseline: Dict):
+
+    for section in (
+        "decode",
+        "decode_lite",
+        "process_frame",
+        "process_frame_full",
+        "process_frame_quote",
+        "process_frame_book",
+        "process_frame_footprint",
+    ):
+        for key, value in result[section].items():
+            before = baseline.get(section, {}).get(key)
+            if not before or key == "ticks":
+                continue
+            change = (value - before) / before * 100
+            name = f"{section}.{key}"
+            print(f"{name:<28} {before:>14.1f} -> {value:>14.1f} ({change:+.1f}%)")
+
+    before = baseline.get("per_instrument_ns")
+    if before:
+        value = result["per_instrument_ns"]
+        print(
+            f"{'per_instrument_ns':<28} {before:>14.1f} -> {value:>14.1f} "
+            f"({(value - before) / before * 100:+.1f}%)"
+        )
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Synthetic feed throughput benchmark")
+    parser.add_argument("--instruments", type=int, default=2000)
+    parser.add_argument("--indices", type=int, default=10)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--frame-interval-ms", type=int, default=250)
+    parser.add_argument("--active-ratio", type=float, default=0.25)
+    parser.add_argument("--out", default="feed_benchmark.json")
+    parser.add_argument("--baseline", help="previous --out file to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    with open(args.out, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(json.dumps(result, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
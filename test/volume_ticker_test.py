@@ -156,3 +156,32 @@
 #         asyncio.run(main())
 #     except KeyboardInterrupt:
 #         log.warning("Exiting...")
+
+
+import asyncio
+
+from server.modules.ticker.replay import MemorySink
+from server.modules.ticker.volume_ticker_clickhouse import VolumeTicker
+
+
+def test_quote_only_frame_moves_the_quote():
+
+    async def run():
+        sink = MemorySink()
+        vt = VolumeTicker(sink=sink, trade_rule="quote")
+        vt.register(["A"])
+
+        t = 1_700_000_000_000
+        # trade at 100.0 against 99.9 / 100.1
+        vt.process_ticks([0], [100.0], [t], [100], [99.9], [100.1])
+        # no trade: the book moves down to 99.5 / 99.6
+        vt.process_ticks([0], [100.0], [t], [100], [99.5], [99.6])
+        # trade at the new ask, a downtick for the tick rule
+        vt.process_ticks([0], [99.6], [t + 1000], [150], [99.5], [99.6])
+
+        await vt.dispose()
+        return sink.rows
+
+    (row,) = asyncio.run(run())
+    _, _, buy, sell, total, _ = row
+    assert (buy, sell, total) == (50, 0, 50)